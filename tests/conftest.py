@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The dashboard modules import each other by bare name, as Streamlit runs them from ui/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ui"))
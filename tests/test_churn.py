@@ -0,0 +1,51 @@
+"""Incremental re-scoring in ui/churn.py."""
+import numpy as np
+
+from churn import FEATURES, ChurnScorer, churn_scores
+
+
+def _scorer(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    features = {
+        "last_contact_days": rng.integers(0, 120, n),
+        "excess_return": rng.normal(0, 3, n),
+        "fee_bps": rng.integers(20, 150, n),
+        "net_flow": rng.normal(0, 5, n),
+    }
+    ids = np.array([f"c{i}" for i in range(n)], dtype=object)
+    return ChurnScorer(ids, ids, features), features
+
+
+def test_incremental_refresh_matches_a_full_rescore():
+    scorer, features = _scorer()
+    assert scorer.refresh() == 200 and scorer.version == 1
+    scorer.update(["c3", "c7"], fee_bps=300)
+    scorer.record_contact("c10")
+    assert scorer.dirty_count() == 3
+    assert scorer.refresh() == 3 and scorer.version == 2
+    features["fee_bps"][[3, 7]] = 300
+    features["last_contact_days"][10] = 0
+    prob, reason = churn_scores(np.column_stack([np.asarray(features[f], dtype=np.float32) for f in FEATURES]))
+    np.testing.assert_array_equal(scorer.prob, prob)
+    np.testing.assert_array_equal(scorer.reason, reason)
+
+
+def test_refresh_without_changes_keeps_the_version():
+    scorer, _ = _scorer()
+    scorer.refresh()
+    scorer.update(["c1"], fee_bps=scorer._features[1, list(FEATURES).index("fee_bps")])
+    assert scorer.refresh() == 1 and scorer.version == 1
+    assert scorer.refresh() == 0
+
+
+def test_unknown_clients_are_ignored():
+    scorer, _ = _scorer()
+    assert scorer.record_contact("nobody") == 0
+    assert scorer.update(["c1", "nobody"], net_flow=-50) == 1
+
+
+def test_top_is_highest_first():
+    scorer, _ = _scorer()
+    scorer.refresh()
+    top = scorer.top(10)
+    np.testing.assert_array_equal(top, np.argsort(-scorer.prob, kind="stable")[:10])
@@ -0,0 +1,26 @@
+"""Client search in ui/client_registry.py."""
+import numpy as np
+
+from client_registry import ClientRegistry
+
+
+def _registry():
+    return ClientRegistry({
+        "client_id": np.array(["c1", "c2", "c3", "c10"], dtype=object),
+        "client_name": ["Ann Lee", "Bob Stone", "ann marsh", "Bob Stone"],
+        "aum_usd": np.ones(4),
+        "risk_profile": np.zeros(4, dtype=np.int8),
+    })
+
+
+def test_search_matches_names_and_ids_case_insensitively_in_book_order():
+    registry = _registry()
+    assert registry.search("ANN").tolist() == ["c1", "c3"]
+    assert registry.search(" stone ").tolist() == ["c2", "c10"]
+    assert registry.search("c1").tolist() == ["c1", "c10"]
+    assert registry.search("nobody").tolist() == []
+
+
+def test_empty_search_returns_the_whole_book():
+    registry = _registry()
+    assert registry.search("") is registry.ids
@@ -0,0 +1,84 @@
+"""TTL/LRU behaviour of ui/data_cache.py and the ``@cached`` decorator."""
+import threading
+import time
+
+import numpy as np
+
+from data_cache import DataCache, _sizeof, cached
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_provider_ttl():
+    clock = Clock()
+    cache = DataCache(ttls={"short": 5}, default_ttl=60, clock=clock)
+    cache.put(("short", None, None, ()), 1)
+    cache.put(("other", None, None, ()), 2)
+    clock.now = 10
+    assert cache.get(("short", None, None, ())) == (False, None)
+    assert cache.get(("other", None, None, ())) == (True, 2)
+    assert cache.stats()["short"]["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = DataCache(max_bytes=30, ttls={})
+    for name in "abc":
+        cache.put((name, None, None, ()), name, nbytes=10)
+    cache.get(("a", None, None, ()))
+    cache.put(("d", None, None, ()), "d", nbytes=10)
+    assert [cache.get((name, None, None, ()))[0] for name in "abcd"] == [True, False, True, True]
+    assert cache.stats()["b"]["evictions"] == 1
+    assert cache.total_bytes == 30
+
+
+def test_object_arrays_count_their_elements():
+    strings = np.array(["x" * 1000] * 10, dtype=object)
+    assert _sizeof(strings) > 10 * 1000
+
+
+def test_cached_shares_entries_across_default_arguments_and_key_params():
+    cache = DataCache(ttls={})
+    calls = []
+
+    @cached("double", cache=cache, key_params=("version",))
+    def double(x, scale=2):
+        calls.append(x)
+        return x * scale
+
+    assert double(3) == double(3, scale=2) == double(3, 2) == 6
+    assert calls == [3]
+    double(3, version=1)
+    double(3, version=1)
+    assert calls == [3, 3]
+
+
+def test_concurrent_misses_run_the_provider_once():
+    cache = DataCache(ttls={})
+    calls = []
+    start = threading.Barrier(8)
+
+    @cached("slow", cache=cache)
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(slow())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["value"] * 8
+    assert len(calls) == 1
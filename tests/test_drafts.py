@@ -0,0 +1,33 @@
+"""Template compilation in ui/drafts.py, including placeholders nested in format specs."""
+import pytest
+
+from drafts import DEFAULT_TEMPLATE, CompiledTemplate
+
+CLIENT = {"client_id": "C1", "name": "Ann", "risk_profile": "Growth", "aum": 1234.5, "rm": "Bo"}
+
+
+def test_default_template():
+    draft = CompiledTemplate(DEFAULT_TEMPLATE).render(CLIENT)
+    assert draft.startswith("Dear Ann,") and "Growth portfolio ($1,234)" in draft
+
+
+def test_width_from_placeholder():
+    template = CompiledTemplate("{name:>{aum}}|")
+    assert template.fields == ["name", "aum"]
+    assert template.render({**CLIENT, "aum": 6}) == "   Ann|"
+
+
+def test_whole_spec_from_placeholder():
+    template = CompiledTemplate("{aum:{rm}} {rm}")
+    assert template.fields == ["aum", "rm"]
+    assert template.render({**CLIENT, "rm": ">8.1f"}) == "  1234.5 >8.1f"
+
+
+def test_escaped_braces():
+    assert CompiledTemplate("{{name}} {name}").render(CLIENT) == "{name} Ann"
+
+
+@pytest.mark.parametrize("text", ["{nickname}", "{aum:{x}}", "{aum:{}}", "{aum:{0}}", "{name:>{aum:{rm}}}"])
+def test_rejects_unknown_or_deeply_nested(text):
+    with pytest.raises(ValueError):
+        CompiledTemplate(text)
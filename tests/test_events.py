@@ -0,0 +1,76 @@
+"""ui/events.py queries against a day-by-day scan of the same events."""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from events import EVENT_KINDS, EventIndex
+from mock_data import RETIREMENT_AGE
+
+
+def _index(seed=0, n=300):
+    rng = np.random.default_rng(seed)
+    birth = np.datetime64("1940-01-01") + rng.integers(0, 60 * 365, n)
+    birth[:3] = np.datetime64("1960-02-29")  # leap-day birthdays
+    maturity_client = rng.integers(0, n, 80)
+    maturity_date = np.datetime64("2025-01-01") + rng.integers(0, 3 * 365, 80)
+    ids = np.array([f"c{i}" for i in range(n)], dtype=object)
+    return EventIndex(ids, ids, birth, maturity_client, maturity_date, rng.integers(1, 9, 80) * 1e6), \
+        birth, maturity_client, maturity_date
+
+
+def _on(year, month, day):
+    if (month, day) == (2, 29):
+        try:
+            return date(year, 2, 29)
+        except ValueError:
+            return date(year, 2, 28)
+    return date(year, month, day)
+
+
+def _scan(birth, maturity_client, maturity_date, start, end):
+    events = set()
+    for client, d in zip(maturity_client, maturity_date.astype(object)):
+        if start <= d < end:
+            events.add((d, "MATURITY", int(client)))
+    for client, b in enumerate(birth.astype(object)):
+        retire = date(b.year + RETIREMENT_AGE, 3, 1) if (b.month, b.day) == (2, 29) else b.replace(year=b.year + RETIREMENT_AGE)
+        if start <= retire < end:
+            events.add((retire, "RETIREMENT", client))
+        for year in range(start.year, end.year + 1):
+            d = _on(year, b.month, b.day)
+            if year > b.year and start <= d < end:
+                events.add((d, "BIRTHDAY", client))
+    return events
+
+
+def _as_set(events):
+    return {(d, EVENT_KINDS[k], int(c)) for d, k, c in zip(events.date.astype(object), events.kind, events.client)}
+
+
+@pytest.mark.parametrize("start, days", [(date(2025, 3, 1), 30), (date(2027, 12, 20), 400), (date(2026, 2, 27), 3)])
+def test_window_matches_a_scan(start, days):
+    index, *data = _index()
+    end = start + timedelta(days=days)
+    events = index.window(start, end)
+    assert _as_set(events) == _scan(*data, start, end)
+    assert len(events.date) == len(_scan(*data, start, end))
+    assert (np.diff(events.date.astype(np.int64)) >= 0).all()
+
+
+def test_upcoming_is_the_start_of_the_window():
+    index, *data = _index(seed=1)
+    now = date(2025, 6, 1)
+    events = index.upcoming(now, 40)
+    assert len(events.date) == 40
+    expected = sorted(_scan(*data, now, now + timedelta(days=3 * 366)))[:40]
+    assert [d for d, _, _ in sorted(_as_set(events))] == [d for d, _, _ in expected]
+
+
+def test_kind_filter_and_clients_with():
+    index, birth, maturity_client, maturity_date = _index(seed=2)
+    start, end = date(2025, 1, 1), date(2026, 1, 1)
+    maturities = index.window(start, end, kinds=["MATURITY"])
+    assert set(EVENT_KINDS[k] for k in maturities.kind) <= {"MATURITY"}
+    expected = {c for d, kind, c in _scan(birth, maturity_client, maturity_date, start, end) if kind == "MATURITY"}
+    assert set(index.clients_with("MATURITY", start, end).tolist()) == expected
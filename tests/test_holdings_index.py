@@ -0,0 +1,63 @@
+"""Exposure lookups and incremental updates of ui/holdings_index.py."""
+import numpy as np
+import pytest
+
+import holdings_index
+from holdings_index import HoldingsIndex
+
+TICKERS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _positions(n_clients=50, n_rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = {}
+    for client, code, mv in zip(rng.integers(0, n_clients, n_rows), rng.integers(0, len(TICKERS), n_rows),
+                                rng.integers(1, 100, n_rows) * 1000.0):
+        positions[int(client), TICKERS[code]] = mv
+    return positions
+
+
+def _index(positions, n_clients=50):
+    ids = np.array([f"c{i}" for i in range(n_clients)], dtype=object)
+    keys = list(positions)
+    holdings = {
+        "client": np.array([c for c, _ in keys], dtype=np.int64),
+        "instrument": np.array([TICKERS.index(t) for _, t in keys], dtype=np.int64),
+        "mv_usd": np.array([positions[k] for k in keys]),
+    }
+    return HoldingsIndex(ids, ids, np.full(n_clients, 1e6), holdings, instruments=TICKERS)
+
+
+def _expected(positions, ticker):
+    held = sorted(((mv, c) for (c, t), mv in positions.items() if t == ticker and mv > 0), key=lambda p: -p[0])
+    return len(held), sum(mv for mv, _ in held), [mv for mv, _ in held]
+
+
+def _check(index, positions):
+    for ticker in TICKERS:
+        holders, total, mvs = _expected(positions, ticker)
+        assert index.exposure(ticker) == (holders, pytest.approx(total))
+        assert index.holders(ticker)["mv_usd"].tolist() == mvs
+        assert index.holders(ticker, top=3)["mv_usd"].tolist() == mvs[:3]
+
+
+def test_lookups_match_a_scan_of_the_positions():
+    positions = _positions()
+    index = _index(positions)
+    _check(index, positions)
+    assert index.exposure("ZZZ") == (0, 0.0)
+    assert index.impact("AAA", 10) == pytest.approx(_expected(positions, "AAA")[1] / 10)
+
+
+@pytest.mark.parametrize("compact_after", [10000, 5])
+def test_updates_match_a_rebuilt_index(monkeypatch, compact_after):
+    monkeypatch.setattr(holdings_index, "COMPACT_AFTER", compact_after)
+    positions = _positions()
+    index = _index(positions)
+    rng = np.random.default_rng(1)
+    changes = [(int(c), TICKERS[t], float(mv)) for c, t, mv in
+               zip(rng.integers(0, 50, 40), rng.integers(0, len(TICKERS), 40), rng.integers(0, 3, 40) * 5000.0)]
+    index.apply([f"c{c}" for c, _, _ in changes], [t for _, t, _ in changes], [mv for _, _, mv in changes])
+    for c, t, mv in changes:
+        positions[c, t] = mv
+    _check(index, positions)
@@ -0,0 +1,22 @@
+"""Incremental aggregates in ui/market_stream.py."""
+import numpy as np
+
+from market_stream import SECTORS, MarketStream, SimulatedTickSource
+
+
+def test_sector_returns_match_a_full_recompute():
+    stream = MarketStream(source=SimulatedTickSource(seed=0))
+    for _ in range(50):
+        stream.ingest(*stream.source.next_batch(200))
+    universe = stream.universe
+    chg = (stream._last / universe["Close"].to_numpy() - 1) * 100
+    for i, sector in enumerate(SECTORS):
+        rows = (universe["Sector"] == sector).to_numpy()
+        weight = universe["Market Weight"].to_numpy()[rows]
+        assert np.isclose(stream.sector_returns()[i], (weight * chg[rows]).sum() / weight.sum())
+
+
+def test_heatmap_frame_covers_the_sectors_only():
+    frame = MarketStream().heatmap_frame()
+    assert frame["Sector"].tolist() == SECTORS  # Fixed Income (LQD) has no tile
+    assert (frame["Market Weight"] > 0).all()
@@ -0,0 +1,44 @@
+"""ui/matching.py against a dense client x product score matrix."""
+import numpy as np
+import pytest
+
+from matching import MATCH_THRESHOLD, RISK_TARGETS, client_codes, match_products, product_codes, suitability_table
+
+
+def _inputs(n_clients, n_products, seed, step=None):
+    rng = np.random.default_rng(seed)
+    profile = rng.integers(0, len(RISK_TARGETS), n_clients)
+    codes = client_codes(profile, rng.integers(0, 16, n_clients), rng.integers(0, 16, n_clients) & rng.integers(0, 16, n_clients))
+    gaps = rng.normal(0, 0.05, (n_clients, RISK_TARGETS.shape[1])).astype(np.float32)
+    if step:  # coarse gaps, so many clients tie on a product's score
+        gaps = (np.round(gaps / step) * step).astype(np.float32)
+    product_code = product_codes(rng.integers(0, len(RISK_TARGETS), n_products), rng.integers(0, 16, n_products))
+    product_class = rng.integers(0, RISK_TARGETS.shape[1], n_products)
+    return codes, gaps, product_code, product_class
+
+
+def _dense(codes, gaps, product_code, product_class, k):
+    score = suitability_table()[codes][:, product_code] + gaps[:, product_class]  # (clients, products)
+    counts = np.count_nonzero(score > MATCH_THRESHOLD, axis=0)
+    order = np.argsort(-score, axis=0, kind="stable")[:k].T  # ties by client index
+    top_score = np.take_along_axis(score.T, order, 1)
+    top_idx = np.where(top_score > MATCH_THRESHOLD, order, -1)
+    return counts, top_idx, top_score
+
+
+@pytest.mark.parametrize("step", [None, 0.02])
+@pytest.mark.parametrize("chunk_size", [7, 64, 10000])
+def test_matches_dense_computation(chunk_size, step):
+    args = _inputs(500, 40, seed=chunk_size, step=step)
+    counts, top_idx, top_score = match_products(*args, k=5, chunk_size=chunk_size)
+    expected_counts, expected_idx, expected_score = _dense(*args, k=5)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_array_equal(top_idx, expected_idx)
+    np.testing.assert_allclose(top_score, expected_score)
+
+
+def test_fewer_clients_than_k():
+    args = _inputs(3, 4, seed=0)
+    counts, top_idx, top_score = match_products(*args, k=5, chunk_size=2)
+    assert top_idx.shape == top_score.shape == (4, 3)
+    np.testing.assert_array_equal(top_idx, _dense(*args, k=5)[1])
@@ -0,0 +1,56 @@
+"""Priority ordering and server-side paging in ui/scoring.py."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from scoring import query_priority, reason_masks, top_k
+
+
+def _book(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # Few distinct values, so nearly every page boundary falls inside a run of ties
+    return {"priority_score": rng.integers(0, 5, n), "aum_usd": rng.integers(0, 3, n) * 1e6}
+
+
+def _stable_order(values, descending):
+    return pd.Series(values).sort_values(ascending=not descending, kind="stable").index.to_numpy()
+
+
+@pytest.mark.parametrize("sort_by", ["priority_score", "aum_usd"])
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_concatenate_to_one_stable_sort(sort_by, descending):
+    book = _book(1000)
+    scores = book["priority_score"]
+    masks = reason_masks(scores)
+    pages = []
+    for offset in range(0, 1000, 25):
+        idx, total = query_priority(book, scores, masks, sort_by, descending, offset=offset, limit=25)
+        assert total == 1000
+        pages.append(idx)
+    np.testing.assert_array_equal(np.concatenate(pages), _stable_order(book[sort_by], descending))
+
+
+def test_filtered_pages_follow_book_order_within_ties():
+    book = _book(500, seed=1)
+    scores = book["priority_score"]
+    masks = reason_masks(scores)
+    include = np.arange(500) % 3 != 0
+    pages = [query_priority(book, scores, masks, include=include, offset=o, limit=7)[0] for o in range(0, 500, 7)]
+    keep = np.flatnonzero(include)
+    np.testing.assert_array_equal(np.concatenate(pages), keep[_stable_order(scores[keep], True)])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_k_matches_stable_sort_with_ties(seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 10, 300).astype(np.float32)
+    expected = _stable_order(scores, True)
+    for k in (1, 7, 50, 299, 300, 400):
+        np.testing.assert_array_equal(top_k(scores, k), expected[:k])
+    np.testing.assert_array_equal(top_k(scores, None), expected)
+
+
+def test_top_k_is_a_prefix_of_a_larger_top_k():
+    scores = np.repeat([3.0, 2.0, 1.0], 40)[np.random.default_rng(0).permutation(120)]
+    np.testing.assert_array_equal(top_k(scores, 50), top_k(scores, 100)[:50])
+    assert len(top_k(scores, 0)) == 0
@@ -0,0 +1,115 @@
+"""Book-wide churn-risk scoring with incremental re-scoring.
+
+``ChurnScorer`` holds the churn features of every client as column arrays
+(days since last contact, excess return, fees, net flows) and a logistic
+score per client. ``update`` / ``record_contact`` change features in place
+and set the clients' dirty flags. ``refresh`` re-scores only the dirty rows
+in one vectorized pass. The first refresh scores the whole book; intraday
+refreshes after a handful of contacts touch a handful of rows.
+
+``version`` increases whenever a refresh changed any score, so callers can
+cache results derived from the scores keyed by it (see
+``mock_data.get_churn_risk_data``).
+"""
+import threading
+
+import numpy as np
+
+from mock_data import BOOK_SIZE, get_churn_features, get_mock_book
+from scoring import top_k
+
+# --- MODEL ---
+
+# Feature -> (weight, reference value): each feature adds weight * (value - reference) to the log-odds.
+FEATURES = {
+    "last_contact_days": (0.08, 14.0),
+    "excess_return": (-0.35, 0.0),  # 12m return vs benchmark, %
+    "fee_bps": (0.02, 80.0),
+    "net_flow": (-0.15, 0.0),  # 12m net flow, % of AUM
+}
+INTERCEPT = -1.5
+# Reason shown for a client: the feature contributing most to its score (FEATURES order)
+REASONS = ["Low Contact", "Performance", "Fee Sensitivity", "Outflows"]
+RISK_BANDS = [(70, "High"), (40, "Medium"), (0, "Low")]
+
+_WEIGHTS = np.array([w for w, _ in FEATURES.values()], dtype=np.float32)
+_REFERENCE = np.array([r for _, r in FEATURES.values()], dtype=np.float32)
+
+
+def churn_scores(features):
+    """``(probability %, reason code)`` for a ``(N, len(FEATURES))`` feature block."""
+    contrib = (features - _REFERENCE) * _WEIGHTS
+    prob = 100 / (1 + np.exp(-(INTERCEPT + contrib.sum(axis=1))))
+    return prob.astype(np.float32), contrib.argmax(axis=1).astype(np.int8)
+
+
+def risk_labels(prob):
+    return np.select([prob >= lo for lo, _ in RISK_BANDS], [label for _, label in RISK_BANDS], "Low")
+
+
+class ChurnScorer:
+    """Churn features and scores for a book, re-scored incrementally via dirty flags."""
+
+    def __init__(self, client_ids, client_names, features):
+        self.client_ids = client_ids
+        self.client_names = client_names
+        self._pos = {cid: i for i, cid in enumerate(client_ids)}
+        self._features = np.column_stack([np.asarray(features[f], dtype=np.float32) for f in FEATURES])
+        n = len(client_ids)
+        self.prob = np.zeros(n, dtype=np.float32)
+        self.reason = np.zeros(n, dtype=np.int8)
+        self._dirty = np.ones(n, dtype=bool)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.last_rescored = 0
+
+    def update(self, client_ids, **columns):
+        """Sets feature values (scalars or per-client sequences) and marks the clients dirty."""
+        rows = np.fromiter((self._pos[c] for c in client_ids if c in self._pos), dtype=np.intp)
+        with self._lock:
+            for name, values in columns.items():
+                self._features[rows, list(FEATURES).index(name)] = values
+            self._dirty[rows] = True
+        return len(rows)
+
+    def record_contact(self, client_id):
+        """The RM just contacted the client: days since last contact drop to zero."""
+        return self.update([client_id], last_contact_days=0)
+
+    def refresh(self):
+        """Re-scores the dirty clients; returns how many were re-scored."""
+        with self._lock:
+            rows = np.flatnonzero(self._dirty)
+            if len(rows):
+                prob, reason = churn_scores(self._features[rows])
+                if not (np.array_equal(prob, self.prob[rows]) and np.array_equal(reason, self.reason[rows])):
+                    self.version += 1
+                self.prob[rows], self.reason[rows] = prob, reason
+                self._dirty[rows] = False
+            self.last_rescored = len(rows)
+            return len(rows)
+
+    def top(self, k):
+        """Rows of the ``k`` highest churn probabilities, highest first."""
+        with self._lock:
+            return top_k(self.prob, k)
+
+    def dirty_count(self):
+        return int(self._dirty.sum())
+
+
+_scorers = {}
+_lock = threading.Lock()
+
+
+def get_churn_scorer(book_size=BOOK_SIZE):
+    """Returns the shared scorer for ``book_size``, building it on first use."""
+    scorer = _scorers.get(book_size)
+    if scorer is None:
+        with _lock:
+            scorer = _scorers.get(book_size)
+            if scorer is None:
+                book = get_mock_book(book_size)
+                scorer = _scorers[book_size] = ChurnScorer(
+                    book["client_id"], book["client_name"], get_churn_features(book_size))
+    return scorer
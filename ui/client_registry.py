@@ -0,0 +1,96 @@
+"""Process-wide, indexed client registry.
+
+Built once per server process from the client book and shared by every page
+and session. Lookups by id or name are O(1) dict hits instead of DataFrame
+boolean masks, and the column arrays are read-only so the snapshot can be
+shared safely between threads. ``search`` backs the client pickers, which only
+send a bounded page of matches to the browser.
+"""
+import threading
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from mock_data import BOOK_SIZE, RISK_PROFILES, get_mock_book
+
+
+def _frozen(values, dtype=None):
+    arr = np.array(values, dtype=dtype)
+    arr.setflags(write=False)
+    return arr
+
+
+class ClientRegistry:
+    """Immutable snapshot of the client book with id <-> name hash indexes."""
+
+    def __init__(self, book):
+        self.ids = _frozen(book["client_id"], dtype=object)
+        self.aum_usd = _frozen(book["aum_usd"])
+        # Categorical-encoded columns: small integer codes plus one copy of each label.
+        self.names = pd.Categorical(book["client_name"])
+        self.risk_profiles = pd.Categorical.from_codes(book["risk_profile"], categories=RISK_PROFILES)
+
+        self._pos = MappingProxyType({cid: i for i, cid in enumerate(self.ids)})
+        by_name = {}
+        for cid, name in zip(self.ids, book["client_name"]):
+            by_name.setdefault(name, []).append(cid)
+        self._ids_by_name = MappingProxyType({k: tuple(v) for k, v in by_name.items()})
+        self._search_keys = None  # lower-cased (name categories, ids), built on the first search
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, client_id):
+        return client_id in self._pos
+
+    def position(self, client_id):
+        """Row of ``client_id`` in the book arrays."""
+        return self._pos[client_id]
+
+    def positions(self, client_ids):
+        return np.fromiter((self._pos[c] for c in client_ids), dtype=np.intp)
+
+    def name_of(self, client_id):
+        return self.names[self._pos[client_id]]
+
+    def risk_profile_of(self, client_id):
+        return self.risk_profiles[self._pos[client_id]]
+
+    def ids_for_name(self, name):
+        """All client ids sharing a display name (names are not unique)."""
+        return self._ids_by_name.get(name, ())
+
+    def id_for_name(self, name):
+        ids = self.ids_for_name(name)
+        if not ids:
+            raise KeyError(name)
+        return ids[0]
+
+    def search(self, query):
+        """Ids whose name or id contains ``query`` (case-insensitive), in book order."""
+        query = query.strip().lower()
+        if not query:
+            return self.ids
+        if self._search_keys is None:
+            self._search_keys = (self.names.categories.str.lower(), pd.Index(self.ids.astype(str)).str.lower())
+        names, ids = self._search_keys
+        # Match each distinct name once, then map back to the clients through the codes
+        hit = np.asarray(names.str.contains(query, regex=False))[self.names.codes]
+        hit |= np.asarray(ids.str.contains(query, regex=False))
+        return self.ids[hit]
+
+
+_registries = {}
+_lock = threading.Lock()
+
+
+def get_registry(book_size=BOOK_SIZE):
+    """Returns the shared registry, building it on first use."""
+    registry = _registries.get(book_size)
+    if registry is None:
+        with _lock:
+            registry = _registries.get(book_size)
+            if registry is None:
+                registry = _registries[book_size] = ClientRegistry(get_mock_book(book_size))
+    return registry
@@ -0,0 +1,42 @@
+"""Render-time display formats for the typed market tables and highlight bands.
+
+Providers return raw numbers (float32 $M amounts and percent moves) and
+categoricals. Labels, currency and sign formatting are applied here, when a
+table is handed to ``st.dataframe``, so the data itself stays sortable and
+compact.
+"""
+import streamlit as st
+
+from highlight import BAND_COLUMN, band_labels
+
+_MILLIONS = "$%.0fM"
+_PERCENT = "%+.1f%%"
+
+MARKET_COLUMNS = {
+    "Buy Pre": st.column_config.NumberColumn("Buy (Pre)", format=_MILLIONS),
+    "Buy Wk": st.column_config.NumberColumn("Buy (Wk)", format=_MILLIONS),
+    "Sell Pre": st.column_config.NumberColumn("Sell (Pre)", format=_MILLIONS),
+    "Sell Wk": st.column_config.NumberColumn("Sell (Wk)", format=_MILLIONS),
+    "NetBuy": st.column_config.NumberColumn("Net Buy (M)", format=_MILLIONS),
+    "Chg%": st.column_config.NumberColumn("Change %", format=_PERCENT),
+    "Move": st.column_config.NumberColumn("Move %", format="%+.2f%%"),
+    "Post-Move": st.column_config.NumberColumn("Post-Move", format=_PERCENT),
+    "Holders": st.column_config.NumberColumn("Clients", format="%d"),
+    "Impact": st.column_config.NumberColumn("Client Impact", format="dollar"),
+    "Trend": st.column_config.LineChartColumn("Trend"),  # live mode sparkline (market_stream)
+}
+
+
+def market_columns(df, **overrides):
+    """``column_config`` for the columns of ``df`` that have a market format."""
+    config = {c: MARKET_COLUMNS[c] for c in df.columns if c in MARKET_COLUMNS}
+    config.update(overrides)
+    return config
+
+
+def band_columns(band_sets, column=BAND_COLUMN, label="Flags"):
+    """``column_config`` rendering a ``highlight.with_bands`` column as coloured labels."""
+    labels = band_labels(band_sets)
+    return {column: st.column_config.MultiselectColumn(
+        label, options=[l for l, _ in labels], color=[c for _, c in labels], width="small",
+    )}
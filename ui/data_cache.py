@@ -0,0 +1,247 @@
+"""TTL + LRU cache shared by the mock data providers.
+
+Entries are keyed by ``(provider, client_id, as_of)`` plus any extra call
+arguments, expire after a per-provider TTL and are evicted least-recently-used
+once the cache exceeds its memory budget. The cache lives at module level, so
+every Streamlit session in the server process shares it.
+
+Cached values are handed out as-is: callers must treat them as read-only.
+"""
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import provider_span
+
+# --- SETTINGS ---
+
+DEFAULT_TTL = 300  # seconds
+MAX_BYTES = 256 * 1024 * 1024
+
+# Market data goes stale quickly, house views and client books much less so.
+PROVIDER_TTLS = {
+    "book": 900,
+    "priority_list": 300,
+    "priority_page": 300,
+    "portfolio": 900,
+    "book_portfolios": 900,
+    "book_holdings": 900,
+    "product_matches": 900,
+    "maturity_flags": 3600,
+    "risk_exposure": 900,
+    "book_risk": 900,
+    "top_drift": 900,
+    "insights": 900,
+    "market_heatmap": 60,
+    "market_movers": 60,
+    "stock_briefing": 60,
+    "market_one_liners": 60,
+    "market_briefing_tabs": 600,
+    "house_asset_allocation": 3600,
+}
+
+
+def _sizeof(value):
+    """Rough in-memory footprint of a cached value, in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:  # nbytes only counts the pointers
+            return int(value.nbytes) + sum(map(sys.getsizeof, value.ravel()))
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "nbytes")
+
+    def __init__(self, value, expires_at, nbytes):
+        self.value = value
+        self.expires_at = expires_at
+        self.nbytes = nbytes
+
+
+class DataCache:
+    """Thread-safe TTL + LRU cache with a memory budget and per-provider counters."""
+
+    def __init__(self, max_bytes=MAX_BYTES, ttls=None, default_ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttls = dict(PROVIDER_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {}
+
+    def _counter(self, provider):
+        return self._stats.setdefault(provider, {"hits": 0, "misses": 0, "evictions": 0})
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def get(self, key, count=True):
+        """Returns ``(True, value)`` for a live entry, ``(False, None)`` otherwise.
+
+        ``count=False`` leaves the hit/miss counters alone (for re-checks).
+        """
+        provider = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                if count:
+                    self._counter(provider)["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            if count:
+                self._counter(provider)["hits"] += 1
+            return True, entry.value
+
+    def put(self, key, value, ttl=None, nbytes=None):
+        provider = key[0]
+        if ttl is None:
+            ttl = self.ttls.get(provider, self.default_ttl)
+        if nbytes is None:
+            nbytes = _sizeof(value)
+        if nbytes > self.max_bytes:
+            return value  # never worth evicting the whole cache for one entry
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, self._clock() + ttl, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                old_key = next(iter(self._entries))
+                self._drop(old_key)
+                self._counter(old_key[0])["evictions"] += 1
+        return value
+
+    def get_or_load(self, key, loader, ttl=None):
+        hit, value = self.get(key)
+        if hit:
+            return value
+        return self.put(key, loader(), ttl)
+
+    def invalidate(self, provider=None, client_id=None):
+        """Drops matching entries (all of them when called without filters). Returns the count."""
+        with self._lock:
+            keys = [
+                k for k in self._entries
+                if (provider is None or k[0] == provider) and (client_id is None or k[1] == client_id)
+            ]
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    def stats(self):
+        """Per-provider hit/miss/eviction counters plus live entry counts and bytes."""
+        with self._lock:
+            out = {p: dict(c, entries=0, bytes=0) for p, c in self._stats.items()}
+            for key, entry in self._entries.items():
+                row = out.setdefault(key[0], {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0})
+                row["entries"] += 1
+                row["bytes"] += entry.nbytes
+            return out
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide instance shared by all sessions.
+DATA_CACHE = DataCache()
+
+# (cache, key) -> Future of a load in progress, so concurrent misses on one key run the provider once
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _load_once(store, key, load, ttl, span):
+    """Runs ``load`` for a missed key unless another thread already is; then shares its result."""
+    flight = (id(store), key)
+    with _inflight_lock:
+        future = _inflight.get(flight)
+        leader = future is None
+        if leader:
+            hit, value = store.get(key, count=False)  # a load may have finished since our miss
+            if hit:
+                return value
+            future = _inflight[flight] = Future()
+    if not leader:
+        return future.result()
+    try:
+        value = load()
+        span["bytes"] = _sizeof(value)
+        store.put(key, value, ttl, span["bytes"])
+        future.set_result(value)
+        return value
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[flight]
+
+
+def cached(provider, ttl=None, cache=None, key_params=()):
+    """Decorator caching a provider under ``(provider, client_id, as_of, extra args)``.
+
+    Providers taking a ``client_id`` parameter are keyed per client. The
+    wrapped function also accepts an ``as_of`` keyword, plus one keyword per
+    name in ``key_params``. These only take part in the cache key and are not
+    passed on: ``as_of`` pins a snapshot time, and key params carry things like
+    a model version that the provider reads itself. Concurrent misses on one key
+    share a single load. Each call is timed by ``instrumentation.provider_span``.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, as_of=None, **kwargs):
+            store = DATA_CACHE if cache is None else cache
+            extra = tuple((name, kwargs.pop(name, None)) for name in key_params)
+            # Bind with defaults so f(x) and f(x, default=...) share one entry.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            client_id = params.pop("client_id", None)
+            key = (provider, client_id, as_of, tuple(params.items()) + extra)
+            with provider_span(provider) as span:
+                hit, value = store.get(key)
+                if not hit:
+                    value = _load_once(store, key, lambda: func(*args, **kwargs), ttl, span)
+                span["value"] = value
+            return value
+
+        wrapper.provider = provider
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def invalidate(provider=None, client_id=None):
+    return DATA_CACHE.invalidate(provider, client_id)
+
+
+def cache_stats():
+    return DATA_CACHE.stats()
@@ -0,0 +1,239 @@
+"""Pluggable data providers behind the dashboard pages.
+
+Pages read everything through ``get_provider()`` instead of importing
+``mock_data`` directly. ``PB_DATA_BACKEND`` selects the implementation:
+
+* ``mock`` (default): ``MockDataProvider``, backed by the ``mock_data`` getters.
+* ``sql``: ``sql_provider.SqlDataProvider``, backed by the BLUEPRINT tables via
+  SQLAlchemy (a local SQLite file by default, see ``PB_DATABASE_URL``). It
+  serves client, portfolio, recommendation and audit data from the database.
+  The client registry, priority list, drift ranking, churn scores and events
+  are built from its own ``clients`` table, so every id a page offers exists
+  for the foreign keys. It inherits the market-data methods, which have no
+  tables yet, from the mock provider.
+
+The SQL backend is imported only when selected, so the default cold start
+never loads SQLAlchemy.
+"""
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+import pandas as pd
+
+import mock_data
+from churn import get_churn_scorer
+from client_registry import get_registry
+
+DATA_BACKEND = os.environ.get("PB_DATA_BACKEND", "mock")
+
+RECOMMENDATION_STATUSES = ["DRAFT", "APPROVED", "REJECTED"]
+
+
+class DataProvider(ABC):
+    """Everything the pages read and write. Implementations provide all of it."""
+
+    name = None
+
+    # --- Clients & portfolios ---
+    @abstractmethod
+    def book(self, size=None):
+        """Client book as column arrays: client_id, client_name, priority_score, aum_usd, ...
+
+        ``size=None`` is the whole book: every other method works over these clients.
+        """
+
+    @abstractmethod
+    def registry(self):
+        """``client_registry.ClientRegistry`` over ``book()``: the ids every picker offers."""
+
+    @abstractmethod
+    def priority_page(self, sort_by="priority_score", descending=True, reason=None, client_ids=None,
+                      offset=0, limit=25, score_range=None, aum_range=None):
+        """One page of the priority list over ``book()``; see ``mock_data.get_priority_page``."""
+
+    @abstractmethod
+    def book_risk(self):
+        """Exposure, drift, drift norm and drift rank arrays, rows in ``book()`` order."""
+
+    @abstractmethod
+    def portfolios(self, client_ids):
+        """``(weights, values)`` float32 matrices, one row per client id (columns: ASSET_CLASSES)."""
+
+    @abstractmethod
+    def portfolio(self, client_id):
+        """Asset Class / Allocation / Value USD frame for one client."""
+
+    @abstractmethod
+    def risk_exposure(self, client_id):
+        ...
+
+    @abstractmethod
+    def insights(self, client_id):
+        ...
+
+    # --- Recommendations & audit trail ---
+    @abstractmethod
+    def recommendations(self, client_ids=None, status=None):
+        """Stored recommendation drafts, newest first."""
+
+    @abstractmethod
+    def save_recommendation(self, client_id, content, status="DRAFT"):
+        """Stores a draft and returns its id; raises ValueError for unknown clients or statuses."""
+
+    @abstractmethod
+    def log_action(self, entity_type, entity_id, action, user_id, details=None):
+        """Appends one audit log entry (the log is append-only)."""
+
+    # --- Client management widgets ---
+    @abstractmethod
+    def cashflow(self):
+        ...
+
+    @abstractmethod
+    def high_cash_clients(self):
+        ...
+
+    @abstractmethod
+    def churn_risk(self):
+        ...
+
+    @abstractmethod
+    def record_contact(self, client_id):
+        """The RM contacted the client; its churn score changes on the next ``churn_risk``."""
+
+    @abstractmethod
+    def top_drift(self):
+        """Clients with the largest factor drift (risk_engine), largest first."""
+
+    @abstractmethod
+    def client_events(self):
+        ...
+
+    # --- Investment info widgets ---
+    @abstractmethod
+    def stock_briefing(self):
+        ...
+
+    @abstractmethod
+    def market_one_liners(self):
+        ...
+
+    @abstractmethod
+    def market_briefing_tabs(self):
+        ...
+
+    @abstractmethod
+    def house_asset_allocation(self):
+        ...
+
+    @abstractmethod
+    def product_recommendations(self):
+        ...
+
+    @abstractmethod
+    def seeking_alpha(self):
+        ...
+
+    @abstractmethod
+    def trade_review(self):
+        ...
+
+    @abstractmethod
+    def market_heatmap(self):
+        ...
+
+
+class MockDataProvider(DataProvider):
+    """The ``mock_data`` getters; recommendations and audit entries stay in memory."""
+
+    name = "mock"
+
+    registry = staticmethod(get_registry)
+    priority_page = staticmethod(mock_data.get_priority_page)
+    book_risk = staticmethod(mock_data.get_book_risk)
+    portfolios = staticmethod(mock_data.get_mock_portfolios)
+    portfolio = staticmethod(mock_data.get_mock_portfolio)
+    risk_exposure = staticmethod(mock_data.get_mock_risk_exposure)
+    insights = staticmethod(mock_data.get_mock_insights)
+
+    cashflow = staticmethod(mock_data.get_cashflow_data)
+    high_cash_clients = staticmethod(mock_data.get_high_cash_clients)
+    churn_risk = staticmethod(mock_data.get_churn_risk_data)
+    top_drift = staticmethod(mock_data.get_top_drift)
+    client_events = staticmethod(mock_data.get_client_events)
+
+    stock_briefing = staticmethod(mock_data.get_overseas_stock_briefing)
+    market_one_liners = staticmethod(mock_data.get_market_one_liners)
+    market_briefing_tabs = staticmethod(mock_data.get_market_briefing_tabs)
+    house_asset_allocation = staticmethod(mock_data.get_house_asset_allocation)
+    product_recommendations = staticmethod(mock_data.get_product_recommendations)
+    seeking_alpha = staticmethod(mock_data.get_seeking_alpha_list)
+    trade_review = staticmethod(mock_data.get_trade_review)
+    market_heatmap = staticmethod(mock_data.get_market_heatmap_data)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recommendations = []
+        self._audit = deque(maxlen=10000)
+
+    def book(self, size=None):
+        """The PB_BOOK_SIZE book that the registry, priority list and widgets use."""
+        return mock_data.get_mock_book(mock_data.BOOK_SIZE if size is None else size)
+
+    def record_contact(self, client_id):
+        return get_churn_scorer().record_contact(client_id)
+
+    def recommendations(self, client_ids=None, status=None):
+        with self._lock:
+            rows = list(reversed(self._recommendations))
+        df = pd.DataFrame(rows, columns=["id", "client_id", "status", "content_json", "created_at"])
+        if client_ids is not None:
+            df = df[df["client_id"].isin(list(client_ids))]
+        if status is not None:
+            df = df[df["status"] == status]
+        return df
+
+    def save_recommendation(self, client_id, content, status="DRAFT"):
+        if client_id not in self.registry():
+            raise ValueError(f"unknown client {client_id!r}")
+        if status not in RECOMMENDATION_STATUSES:
+            raise ValueError(f"status must be one of {RECOMMENDATION_STATUSES}")
+        with self._lock:
+            rec_id = len(self._recommendations) + 1
+            self._recommendations.append({
+                "id": rec_id, "client_id": client_id, "status": status,
+                "content_json": json.dumps(content), "created_at": pd.Timestamp.now(),
+            })
+        return rec_id
+
+    def log_action(self, entity_type, entity_id, action, user_id, details=None):
+        with self._lock:
+            self._audit.append({
+                "entity_type": entity_type, "entity_id": entity_id, "action": action,
+                "user_id": user_id, "timestamp": pd.Timestamp.now(), "details_json": json.dumps(details or {}),
+            })
+
+
+_providers = {}
+_lock = threading.Lock()
+
+
+def get_provider(backend=DATA_BACKEND):
+    """Returns the process-wide provider for ``backend`` ("mock" or "sql")."""
+    provider = _providers.get(backend)
+    if provider is None:
+        with _lock:
+            provider = _providers.get(backend)
+            if provider is None:
+                if backend == "mock":
+                    provider = MockDataProvider()
+                elif backend == "sql":
+                    from sql_provider import SqlDataProvider
+                    provider = SqlDataProvider()
+                else:
+                    raise ValueError(f"unknown PB_DATA_BACKEND {backend!r} (expected 'mock' or 'sql')")
+                _providers[backend] = provider
+    return provider
@@ -0,0 +1,200 @@
+"""Time-indexed client events: birthdays, bond maturities and retirement ages.
+
+``EventIndex`` keeps one-off events (maturities, retirement ages) as
+``datetime64[D]`` arrays sorted by date, and birthdays as one entry per
+client sorted by (month, day). Queries are binary searches:
+
+* ``window(start, end)`` finds the one-off slice with two ``searchsorted``
+  calls. For each calendar year in the window it finds the birthday slice
+  the same way, so a birthday is generated only when a query asks for it.
+* ``upcoming(now, n)`` reads at most ``n`` one-offs and ``n`` birthdays per
+  year from ``now``, then merges them: O(log N + n), however large the book.
+
+Feb 29 birthdays fall on Feb 28 in non-leap years. The index is built once
+per process and shared by every session (``get_event_index``). The Events
+widget and the priority scorer's MATURITY flag both read it.
+"""
+import threading
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from mock_data import BOOK_SIZE, RETIREMENT_AGE, get_client_event_data, get_mock_book
+
+# --- EVENT KINDS ---
+
+EVENT_KINDS = ["BIRTHDAY", "MATURITY", "RETIREMENT"]
+KIND = {k: np.int8(i) for i, k in enumerate(EVENT_KINDS)}
+ACTIONS = {"BIRTHDAY": "Send Gift", "MATURITY": "Reinvest Proposal", "RETIREMENT": "Financial Plan Review"}
+
+# Query result: parallel arrays sorted by date; ``value`` is the age for
+# birthdays and the amount for maturities.
+Events = namedtuple("Events", ["date", "kind", "client", "value"])
+
+_FEB28, _FEB29 = 2 * 32 + 28, 2 * 32 + 29
+
+
+def today():
+    return np.datetime64(date.today(), "D")
+
+
+def _month_day(dates):
+    """Sortable (month, day) key: month * 32 + day."""
+    months = dates.astype("M8[M]")
+    return ((months.astype(np.int64) % 12 + 1) * 32 + (dates - months.astype("M8[D]")).astype(np.int64) + 1).astype(np.int16)
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _concat(parts):
+    if not parts:
+        return Events(np.empty(0, "M8[D]"), np.empty(0, np.int8), np.empty(0, np.int32), np.empty(0))
+    return Events(*(np.concatenate(cols) for cols in zip(*parts)))
+
+
+def _sorted(events):
+    order = np.argsort(events.date, kind="stable")
+    return Events(*(col[order] for col in events))
+
+
+class EventIndex:
+    """Sorted one-off events plus lazily generated yearly birthdays."""
+
+    def __init__(self, client_ids, client_names, birth_date, maturity_client, maturity_date, maturity_amount):
+        self.client_ids = client_ids
+        self.client_names = client_names
+        birth_date = np.asarray(birth_date, dtype="M8[D]")
+        # Retirement: the RETIREMENT_AGE-th birthday (month arithmetic, so Feb 29 -> Mar 1)
+        birth_month = birth_date.astype("M8[M]")
+        retirement = (birth_month + 12 * RETIREMENT_AGE).astype("M8[D]") + (birth_date - birth_month.astype("M8[D]"))
+        one_off = Events(
+            np.r_[np.asarray(maturity_date, dtype="M8[D]"), retirement],
+            np.r_[np.full(len(maturity_date), KIND["MATURITY"]), np.full(len(retirement), KIND["RETIREMENT"])],
+            np.r_[np.asarray(maturity_client, dtype=np.int32), np.arange(len(retirement), dtype=np.int32)],
+            np.r_[np.asarray(maturity_amount, dtype=np.float64), np.full(len(retirement), float(RETIREMENT_AGE))],
+        )
+        # One date-sorted slice per kind, so kind-filtered queries stay O(log N + n)
+        self._one_off = {kind: _sorted(Events(*(col[one_off.kind == code] for col in one_off)))
+                         for kind, code in KIND.items() if kind != "BIRTHDAY"}
+        key = _month_day(birth_date)
+        order = np.argsort(key, kind="stable")
+        self._bday_key = key[order]
+        self._bday_client = order.astype(np.int32)
+        self._birth_year = birth_date.astype("M8[Y]").astype(np.int64)[order] + 1970
+
+    def __len__(self):
+        return sum(len(events.date) for events in self._one_off.values())
+
+    # --- Queries ---
+    def _one_offs(self, start, end, kinds=None, limit=None):
+        parts = []
+        for kind, events in self._one_off.items():
+            if kinds is not None and kind not in kinds:
+                continue
+            lo = np.searchsorted(events.date, start, "left")
+            hi = np.searchsorted(events.date, end, "left")
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            parts.append(Events(*(col[lo:hi] for col in events)))
+        return parts
+
+    def _birthdays(self, year, start, end, limit=None):
+        """Birthdays in ``[start, end)``, all within calendar ``year``."""
+        key_lo = _month_day(np.array([start]))[0]
+        key_hi = _month_day(np.array([end - 1]))[0]
+        leap = _is_leap(year)
+        if not leap and key_hi == _FEB28:
+            key_hi = _FEB29
+        lo = np.searchsorted(self._bday_key, key_lo, "left")
+        hi = np.searchsorted(self._bday_key, key_hi, "right")
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        key = self._bday_key[lo:hi].astype(np.int64)
+        born = self._birth_year[lo:hi]
+        keep = born < year
+        key, born = key[keep], born[keep]
+        month = np.datetime64(f"{year}-01", "M") + (key // 32 - 1)
+        dates = month.astype("M8[D]") + (key % 32 - 1)
+        if not leap:
+            dates = np.where(key == _FEB29, dates - 1, dates)  # Feb 29 -> Feb 28
+        return Events(dates, np.full(len(dates), KIND["BIRTHDAY"]), self._bday_client[lo:hi][keep], (year - born).astype(np.float64))
+
+    def window(self, start, end, kinds=None):
+        """Events with ``start <= date < end``, sorted by date."""
+        start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+        parts = self._one_offs(start, end, kinds)
+        if kinds is None or "BIRTHDAY" in kinds:
+            year = start.astype("M8[Y]")
+            while year.astype("M8[D]") < end:
+                next_year = year + 1
+                lo, hi = max(start, year.astype("M8[D]")), min(end, next_year.astype("M8[D]"))
+                parts.append(self._birthdays(int(str(year)), lo, hi))
+                year = next_year
+        return _sorted(_concat(parts))
+
+    def upcoming(self, now, n, kinds=None):
+        """The next ``n`` events on or after ``now``."""
+        now = np.datetime64(now, "D")
+        parts = self._one_offs(now, np.datetime64("9999-12-31"), kinds, limit=n)
+        if (kinds is None or "BIRTHDAY" in kinds) and len(self._bday_key):
+            found, year = 0, now.astype("M8[Y]")
+            last_year = year + n // len(self._bday_key) + 2
+            while found < n and year < last_year:
+                next_year = year + 1
+                part = self._birthdays(int(str(year)), max(now, year.astype("M8[D]")), next_year.astype("M8[D]"), limit=n)
+                parts.append(part)
+                found += len(part.date)
+                year = next_year
+        events = _sorted(_concat(parts))
+        return Events(*(col[:n] for col in events))
+
+    def clients_with(self, kind, start, end):
+        """Book rows with a ``kind`` event in ``[start, end)``."""
+        events = self.window(start, end, kinds=[kind])
+        return np.unique(events.client)
+
+    # --- Display ---
+    def frame(self, events):
+        """Client / Event / Date / Action table for the Events widget."""
+        labels = []
+        for kind, value in zip(events.kind, events.value):
+            name = EVENT_KINDS[kind]
+            if name == "BIRTHDAY":
+                labels.append(f"Birthday ({int(value)}{_ordinal(int(value))})")
+            elif name == "MATURITY":
+                labels.append(f"Bond Maturity (${value / 1e6:.1f}M)")
+            else:
+                labels.append("Retirement Age")
+        return pd.DataFrame({
+            "Client": self.client_names[events.client],
+            "Event": labels,
+            "Date": events.date,
+            "Action": [ACTIONS[EVENT_KINDS[k]] for k in events.kind],
+        })
+
+
+def _ordinal(n):
+    return "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_event_index(book_size=BOOK_SIZE):
+    """Returns the shared event index for ``book_size``, building it on first use."""
+    index = _indexes.get(book_size)
+    if index is None:
+        with _lock:
+            index = _indexes.get(book_size)
+            if index is None:
+                book = get_mock_book(book_size)
+                data = get_client_event_data(book_size)
+                index = _indexes[book_size] = EventIndex(
+                    book["client_id"], book["client_name"], data["birth_date"],
+                    data["maturity_client"], data["maturity_date"], data["maturity_amount"])
+    return index
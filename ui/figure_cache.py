@@ -0,0 +1,43 @@
+"""Content-hash cache for Plotly figures.
+
+Figures are keyed by a chart name, a hash of the input DataFrame's contents and
+the chart parameters, so a chart is only rebuilt when its data actually changes.
+The cache is process-wide: reruns and sessions drawing the same data share one
+figure object, which must therefore not be mutated after it is returned.
+"""
+import hashlib
+
+import pandas as pd
+
+from data_cache import DataCache, _sizeof
+
+FIGURE_TTL = 3600  # seconds
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+FIGURE_CACHE = DataCache(max_bytes=FIGURE_CACHE_BYTES, ttls={}, default_ttl=FIGURE_TTL)
+
+
+def frame_fingerprint(df):
+    """Stable content hash of a DataFrame (values, index, column names and dtypes)."""
+    if df is None:
+        return ""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def figure_bytes(fig):
+    """In-memory size of a figure's trace and layout properties, without serializing it."""
+    # Plotly keeps them as plain dicts of lists / arrays: walking those is ~6x cheaper than to_json().
+    return _sizeof((fig._data, fig._layout))
+
+
+def cached_figure(name, build, df=None, **params):
+    """Returns ``build(df, **params)``, reusing a previous figure for identical inputs."""
+    key = ("figure", None, None, (name, frame_fingerprint(df), repr(sorted(params.items()))))
+    hit, fig = FIGURE_CACHE.get(key)
+    if not hit:
+        fig = build(df, **params)
+        FIGURE_CACHE.put(key, fig, nbytes=figure_bytes(fig))
+    return fig
@@ -0,0 +1,207 @@
+"""Persistent client-group store backed by an embedded SQLite database.
+
+Groups hold client ids, not display names. Names are not unique, and
+``isin`` over names is a linear scan. The database is opened once per server
+process and shared by every session through a small connection pool, so groups
+survive browser refreshes and server restarts.
+
+Schema::
+
+    client_groups(group_id PK, name UNIQUE, created_at)
+    group_members(group_id, client_id) PK (group_id, client_id), WITHOUT ROWID
+    idx_group_members_client ON group_members(client_id)   -- client -> groups
+
+Creating or deleting a group is a single statement on an indexed key (members
+go with the group by cascade). Member sets are cached in memory and dropped on
+every write, so filtering a page by group does not touch the database.
+"""
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+DB_PATH = Path(os.environ.get("PB_GROUPS_DB") or Path(__file__).parent / "data" / "client_groups.db")
+POOL_SIZE = 4
+
+ALL_CLIENTS = "All Clients"  # virtual group: no filter, never stored
+
+# Created on first start of an empty database
+DEFAULT_GROUPS = {
+    "High Net Worth": ["c101", "c103"],
+    "ELS Buyers": ["c102", "c105"],
+    "Risk Focused": ["c104"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS client_groups (
+    group_id   INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS group_members (
+    group_id  INTEGER NOT NULL REFERENCES client_groups(group_id) ON DELETE CASCADE,
+    client_id TEXT NOT NULL,
+    PRIMARY KEY (group_id, client_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_group_members_client ON group_members(client_id);
+"""
+
+
+class GroupStore:
+    """Thread-safe group store with pooled SQLite connections and cached member sets."""
+
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE, seed=DEFAULT_GROUPS):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = queue.LifoQueue()
+        for _ in range(1 if self.path == ":memory:" else pool_size):
+            self._pool.put(self._connect())
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped on every write; guards the caches against stale reads
+        self._names = None
+        self._members = {}
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+            if seed and conn.execute("SELECT 1 FROM client_groups LIMIT 1").fetchone() is None:
+                with self.transaction(conn):
+                    for name, client_ids in seed.items():
+                        self._insert_group(conn, name, client_ids)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrows a pooled connection; statements run in autocommit mode."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @staticmethod
+    @contextmanager
+    def transaction(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _changed(self):
+        with self._lock:
+            self._generation += 1
+            self._names = None
+            self._members.clear()
+
+    @staticmethod
+    def _insert_group(conn, name, client_ids=()):
+        cur = conn.execute("INSERT OR IGNORE INTO client_groups (name) VALUES (?)", (name,))
+        if cur.rowcount and client_ids:
+            conn.executemany(
+                "INSERT OR IGNORE INTO group_members (group_id, client_id) VALUES (?, ?)",
+                [(cur.lastrowid, cid) for cid in client_ids],
+            )
+        return bool(cur.rowcount)
+
+    # --- READS ---
+
+    def group_names(self):
+        """Stored group names in creation order."""
+        names = self._names
+        if names is None:
+            generation = self._generation
+            with self.connection() as conn:
+                names = tuple(r[0] for r in conn.execute("SELECT name FROM client_groups ORDER BY group_id"))
+            with self._lock:
+                if generation == self._generation:
+                    self._names = names
+        return names
+
+    def member_ids(self, name):
+        """frozenset of client ids in the group (empty for unknown groups)."""
+        members = self._members.get(name)
+        if members is None:
+            generation = self._generation
+            with self.connection() as conn:
+                members = frozenset(r[0] for r in conn.execute(
+                    "SELECT m.client_id FROM group_members m JOIN client_groups g USING (group_id) WHERE g.name = ?",
+                    (name,),
+                ))
+            with self._lock:
+                if generation == self._generation:
+                    self._members[name] = members
+        return members
+
+    def groups_of(self, client_id):
+        """Names of the groups a client belongs to (uses the client_id index)."""
+        with self.connection() as conn:
+            return [r[0] for r in conn.execute(
+                "SELECT g.name FROM group_members m JOIN client_groups g USING (group_id) "
+                "WHERE m.client_id = ? ORDER BY g.group_id",
+                (client_id,),
+            )]
+
+    # --- WRITES ---
+
+    def create_group(self, name, client_ids=()):
+        """Creates a group; returns False if the name is taken or reserved."""
+        if not name or name == ALL_CLIENTS:
+            return False
+        with self.connection() as conn:
+            if client_ids:
+                with self.transaction(conn):
+                    created = self._insert_group(conn, name, client_ids)
+            else:
+                created = self._insert_group(conn, name)
+        self._changed()
+        return created
+
+    def delete_group(self, name):
+        """Deletes a group and, by cascade, its memberships. Returns True if it existed."""
+        with self.connection() as conn:
+            deleted = conn.execute("DELETE FROM client_groups WHERE name = ?", (name,)).rowcount
+        self._changed()
+        return bool(deleted)
+
+    def add_members(self, name, client_ids):
+        with self.connection() as conn, self.transaction(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO group_members (group_id, client_id) "
+                "SELECT group_id, ? FROM client_groups WHERE name = ?",
+                [(cid, name) for cid in client_ids],
+            )
+        self._changed()
+
+    def remove_members(self, name, client_ids):
+        with self.connection() as conn, self.transaction(conn):
+            conn.executemany(
+                "DELETE FROM group_members WHERE client_id = ? "
+                "AND group_id = (SELECT group_id FROM client_groups WHERE name = ?)",
+                [(cid, name) for cid in client_ids],
+            )
+        self._changed()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_group_store(path=DB_PATH):
+    """Returns the process-wide store for ``path``, opening it on first use."""
+    store = _stores.get(str(path))
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(str(path))
+            if store is None:
+                store = _stores[str(path)] = GroupStore(path)
+    return store
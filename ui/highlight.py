@@ -0,0 +1,51 @@
+"""Vectorized threshold bands for table highlighting.
+
+A band set maps columns to thresholds, e.g. ``priority_score > 90 -> "Urgent"``.
+``with_bands`` classifies a whole column with one ``np.searchsorted`` call and
+stores the matched labels in a list column next to the data. Providers apply
+it before their result is cached, so a rerun reuses the mask instead of
+recomputing it. Pages render the list column through ``column_formats.band_columns``
+as coloured labels, with no pandas ``Styler`` (whose per-cell translate and
+display-value pass dominates the cost of styled tables).
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# Rows with ``column > above`` get ``label``; the highest band a value reaches wins.
+Band = namedtuple("Band", ["above", "label", "color"])
+
+BAND_COLUMN = "flags"
+
+PRIORITY_BANDS = {
+    "priority_score": [Band(90, "Urgent", "#ffcccb")],
+}
+
+
+def band_codes(values, bands):
+    """0 for no band, i for the i-th lowest threshold exceeded (int8, vectorized)."""
+    thresholds = np.array(sorted(b.above for b in bands), dtype=np.float64)
+    return np.searchsorted(thresholds, np.asarray(values, dtype=np.float64), side="left").astype(np.int8)
+
+
+def band_labels(band_sets):
+    """Every label a band set can produce, in declaration order, with its colour."""
+    return [(b.label, b.color) for bands in band_sets.values() for b in bands]
+
+
+def with_bands(df, band_sets, column=BAND_COLUMN):
+    """Copy of ``df`` with a list column of the band labels each row falls into."""
+    per_column = []
+    for col, bands in band_sets.items():
+        ordered = sorted(bands, key=lambda b: b.above)
+        choices = np.empty(len(ordered) + 1, dtype=object)
+        choices[:] = [()] + [(b.label,) for b in ordered]
+        per_column.append(choices[band_codes(df[col].to_numpy(), ordered)])
+    if len(per_column) == 1:
+        flags = per_column[0]
+    else:
+        flags = np.empty(len(df), dtype=object)
+        flags[:] = [sum(row, ()) for row in zip(*per_column)]
+    out = df.copy(deep=False)
+    out[column] = [list(f) for f in flags]
+    return out
@@ -0,0 +1,172 @@
+"""Process-wide inverted index from instrument to the clients holding it.
+
+Built once per server process from ``mock_data.get_book_holdings``. Each
+ticker owns a contiguous slice of the holder arrays, sorted by market value,
+plus running totals (holder count and market value). Exposure and dollar
+impact for a ticker are therefore O(1), and its largest holders come off the
+front of the slice.
+
+Position changes (``update`` / ``apply``) go to a small overlay and adjust the
+totals in place. Reads merge the overlay into the affected ticker's slice, and
+the base arrays are rebuilt once the overlay grows past ``COMPACT_AFTER``
+entries.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from mock_data import BOOK_SIZE, INSTRUMENTS, get_book_holdings, get_mock_book
+
+COMPACT_AFTER = 10000  # overlay entries before the base arrays are rebuilt
+
+
+class HoldingsIndex:
+    """Ticker -> (client, market value) slices with per-ticker totals."""
+
+    def __init__(self, client_ids, client_names, aum_usd, holdings, instruments=INSTRUMENTS):
+        self.client_ids = client_ids
+        self.client_names = client_names
+        self.aum_usd = np.asarray(aum_usd, dtype=np.float64)
+        self._client_pos = {cid: i for i, cid in enumerate(client_ids)}
+        self.tickers = list(instruments)
+        self._code = {t: i for i, t in enumerate(self.tickers)}
+        self._lock = threading.Lock()
+        self._overlay = {}  # ticker code -> {client position: market value (0 = closed)}
+        self._overlay_size = 0
+        self._build(holdings["client"], holdings["instrument"], np.asarray(holdings["mv_usd"], dtype=np.float64))
+
+    def _build(self, client, instrument, mv):
+        keep = mv > 0
+        client, instrument, mv = client[keep], instrument[keep], mv[keep]
+        order = np.lexsort((-mv, instrument))  # by ticker, largest position first
+        n = len(self.tickers)
+        self._clients = client[order].astype(np.int32)
+        self._mv = mv[order]
+        counts = np.bincount(instrument, minlength=n)
+        self._offsets = np.r_[0, np.cumsum(counts)]
+        self._holders = counts.astype(np.int64)
+        self._total = np.bincount(instrument, mv, minlength=n)
+
+    # --- Lookups ---
+    def exposure(self, ticker):
+        """``(holders, market value)`` of a ticker; zeros when nobody holds it."""
+        code = self._code.get(ticker)
+        if code is None:
+            return 0, 0.0
+        return int(self._holders[code]), float(self._total[code])
+
+    def exposures(self, tickers):
+        """Vectorized ``exposure``: ``(holders, market value)`` arrays in input order."""
+        codes = np.array([self._code.get(t, -1) for t in tickers], dtype=np.int64)
+        found = codes >= 0
+        holders = np.zeros(len(codes), dtype=np.int64)
+        total = np.zeros(len(codes))
+        holders[found] = self._holders[codes[found]]
+        total[found] = self._total[codes[found]]
+        return holders, total
+
+    def impact(self, ticker, move_pct):
+        """Dollar impact on the book of a ``move_pct`` % move in ``ticker``."""
+        return self.exposure(ticker)[1] * move_pct / 100
+
+    def holders(self, ticker, top=None):
+        """Clients holding ``ticker``, largest position first.
+
+        Columns: client_id, client_name, mv_usd and weight (share of the client's AUM).
+        """
+        code = self._code.get(ticker)
+        if code is None:
+            clients, mv = np.empty(0, dtype=np.int32), np.empty(0)
+        else:
+            with self._lock:
+                clients, mv = self._slice(code, top)
+        return pd.DataFrame({
+            "client_id": self.client_ids[clients],
+            "client_name": self.client_names[clients],
+            "mv_usd": mv,
+            "weight": mv / self.aum_usd[clients],
+        })
+
+    def _slice(self, code, top):
+        start, stop = self._offsets[code], self._offsets[code + 1]
+        changed = self._overlay.get(code)
+        if not changed:
+            stop = stop if top is None else min(stop, start + top)
+            return self._clients[start:stop], self._mv[start:stop]
+        clients, mv = self._clients[start:stop], self._mv[start:stop]
+        keep = ~np.isin(clients, np.fromiter(changed, dtype=np.int32, count=len(changed)))
+        extra = [(c, v) for c, v in changed.items() if v > 0]
+        clients = np.r_[clients[keep], np.array([c for c, _ in extra], dtype=np.int32)]
+        mv = np.r_[mv[keep], np.array([v for _, v in extra], dtype=np.float64)]
+        order = np.argsort(-mv, kind="stable")[:top]
+        return clients[order], mv[order]
+
+    # --- Incremental updates ---
+    def update(self, client_id, ticker, mv_usd):
+        """Sets one client's position in ``ticker`` (0 closes it); adds unseen tickers."""
+        pos = self._client_pos[client_id]
+        with self._lock:
+            code = self._code.get(ticker)
+            if code is None:
+                code = len(self.tickers)
+                self._offsets = np.r_[self._offsets, self._offsets[-1]]
+                self._holders = np.r_[self._holders, 0]
+                self._total = np.r_[self._total, 0.0]
+                self.tickers.append(ticker)
+                self._code[ticker] = code
+            changed = self._overlay.setdefault(code, {})
+            old = changed.get(pos)
+            if old is None:
+                start, stop = self._offsets[code], self._offsets[code + 1]
+                hit = np.flatnonzero(self._clients[start:stop] == pos)
+                old = float(self._mv[start + hit[0]]) if len(hit) else 0.0
+                self._overlay_size += 1
+            changed[pos] = float(mv_usd)
+            self._holders[code] += (mv_usd > 0) - (old > 0)
+            self._total[code] += mv_usd - old
+            if self._overlay_size > COMPACT_AFTER:
+                self._compact()
+
+    def apply(self, client_ids, tickers, mv_usd):
+        """Applies a batch of position changes (parallel sequences)."""
+        for client_id, ticker, mv in zip(client_ids, tickers, mv_usd):
+            self.update(client_id, ticker, mv)
+
+    def _compact(self):
+        n_clients = len(self.client_ids)
+        owner = np.repeat(np.arange(len(self._holders)), np.diff(self._offsets))
+        keys = [code * n_clients + pos for code, changed in self._overlay.items() for pos in changed]
+        base = ~np.isin(owner.astype(np.int64) * n_clients + self._clients, keys)
+        extra = [(pos, code, v) for code, changed in self._overlay.items() for pos, v in changed.items()]
+        client = np.r_[self._clients[base], np.array([e[0] for e in extra], dtype=np.int32)]
+        instrument = np.r_[owner[base], np.array([e[1] for e in extra], dtype=np.int64)]
+        mv = np.r_[self._mv[base], np.array([e[2] for e in extra], dtype=np.float64)]
+        self._overlay, self._overlay_size = {}, 0
+        self._build(client, instrument, mv)
+
+
+def with_exposure(df, index, move="Chg%", ticker="Ticker"):
+    """Copy of a market table with ``Holders`` and dollar ``Impact`` columns from the index."""
+    holders, total = index.exposures(df[ticker].astype(str))
+    out = df.copy(deep=False)
+    out["Holders"] = holders
+    out["Impact"] = total * out[move].to_numpy(dtype=np.float64) / 100
+    return out
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_holdings_index(book_size=BOOK_SIZE):
+    """Returns the shared index for ``book_size``, building it on first use."""
+    index = _indexes.get(book_size)
+    if index is None:
+        with _lock:
+            index = _indexes.get(book_size)
+            if index is None:
+                book = get_mock_book(book_size)
+                index = _indexes[book_size] = HoldingsIndex(
+                    book["client_id"], book["client_name"], book["aum_usd"], get_book_holdings(book_size))
+    return index
@@ -0,0 +1,305 @@
+"""Hot-path instrumentation for dashboard widgets and data providers.
+
+Every cached provider call (see ``data_cache.cached``) records its fetch time
+and, when it actually loads, the rows and in-memory bytes it produced. Widgets
+wrapped with ``instrument_widget`` record:
+
+* ``fetch_seconds``  time spent in providers called from the widget (or the
+                     prefetch wait, for widgets fed by ``prefetch``)
+* ``render_seconds`` the rest of the widget's run time
+* ``rows``           rows of the data the widget received or fetched
+* ``bytes_sent``     serialized size of the messages the widget sent to the browser
+                     (not reported when the Streamlit internals it hooks are missing)
+
+Metrics are process-wide and exported in the Prometheus text format, either as
+a textfile (``PB_METRICS_FILE``, for node_exporter's textfile collector) or on
+a local HTTP endpoint (``PB_METRICS_PORT``, served on 127.0.0.1).
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- SETTINGS ---
+
+METRICS_FILE = os.environ.get("PB_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("PB_METRICS_PORT", "0")) or None
+PREFIX = "pb"
+
+log = logging.getLogger(__name__)
+
+# (kind, metric) -> HELP text; kind is also the label name in the export
+HELP = {
+    ("widget", "fetch_seconds"): "Time a widget spent waiting for its data.",
+    ("widget", "render_seconds"): "Time a widget spent rendering, excluding data fetches.",
+    ("widget", "rows"): "Rows of data a widget received.",
+    ("widget", "bytes_sent"): "Serialized bytes a widget sent to the browser.",
+    ("provider", "fetch_seconds"): "Time spent in a data provider call, cache hits included.",
+    ("provider", "rows"): "Rows returned by a data provider load (cache misses only).",
+    ("provider", "bytes"): "In-memory bytes of a data provider load (cache misses only).",
+    ("stream", "ticks"): "Market ticks ingested per batch.",
+    ("stream", "ingest_seconds"): "Time spent ingesting one batch of market ticks.",
+    ("drafts", "drafts"): "Message drafts produced per bulk run.",
+    ("drafts", "rendered"): "Drafts rendered per bulk run (the rest came from the draft cache).",
+    ("drafts", "render_seconds"): "Wall time of one bulk draft run.",
+}
+
+
+class Metrics:
+    """Thread-safe ``(kind, name, metric) -> count / sum / last / max`` store."""
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind, name, **values):
+        with self._lock:
+            for metric, value in values.items():
+                if value is None:
+                    continue
+                s = self._series.get((kind, name, metric))
+                if s is None:
+                    s = self._series[(kind, name, metric)] = {"count": 0, "sum": 0.0, "last": 0.0, "max": 0.0}
+                s["count"] += 1
+                s["sum"] += value
+                s["last"] = value
+                s["max"] = max(s["max"], value)
+
+    def snapshot(self, kind):
+        """``{name: {metric: {count, sum, last, max}}}`` for one kind."""
+        with self._lock:
+            out = {}
+            for (k, name, metric), s in self._series.items():
+                if k == kind:
+                    out.setdefault(name, {})[metric] = dict(s)
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def series(self):
+        with self._lock:
+            return sorted((key, dict(s)) for key, s in self._series.items())
+
+
+# Process-wide instance shared by all sessions.
+METRICS = Metrics()
+
+_local = threading.local()  # per-thread provider nesting depth and fetch totals
+
+
+def rows_of(value):
+    """Row count of a provider result, or None when it has no natural row count."""
+    if hasattr(value, "shape") and len(value.shape):
+        return int(value.shape[0])
+    if isinstance(value, tuple) and value:
+        return rows_of(value[0])  # (frame, total) and (weights, values) results
+    if isinstance(value, dict):
+        for v in value.values():
+            if hasattr(v, "shape") and len(v.shape):
+                return int(v.shape[0])  # columnar dicts of arrays
+        return len(value)
+    if isinstance(value, list):
+        return len(value)
+    return None
+
+
+# --- PROVIDERS ---
+
+@contextmanager
+def provider_span(provider):
+    """Times one provider call. The caller sets ``value``, and ``bytes`` on a cache miss.
+
+    Only the outermost provider on a thread counts towards the enclosing widget's
+    fetch time, so providers built on other providers are not counted twice.
+    """
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    span = {"value": None, "bytes": None}
+    start = time.perf_counter()
+    try:
+        yield span
+    finally:
+        seconds = time.perf_counter() - start
+        _local.depth = depth
+        rows = rows_of(span["value"])
+        if depth == 0:
+            _local.fetch = getattr(_local, "fetch", 0.0) + seconds
+            _local.rows = getattr(_local, "rows", 0) + (rows or 0)
+            _local.calls = getattr(_local, "calls", 0) + 1
+        loaded = span["bytes"] is not None
+        METRICS.observe(
+            "provider", provider, fetch_seconds=seconds,
+            rows=rows if loaded else None, bytes=span["bytes"],
+        )
+
+
+# --- WIDGETS ---
+
+class _ByteCounter:
+    """Counts the serialized size of messages a script run sends while installed.
+
+    Streamlit has no public hook for outgoing messages, so this wraps the private
+    ``ScriptRunContext._enqueue`` (present through Streamlit 1.65, the version this
+    was written against). If a later release drops it, ``bytes`` stays None and
+    no byte counts are reported rather than failing the widget.
+    """
+
+    def __init__(self):
+        self.bytes = None
+        self._ctx = None
+
+    def __enter__(self):
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is not None and callable(getattr(ctx, "_enqueue", None)):
+            self._ctx, self.bytes = ctx, 0
+            self._send = ctx._enqueue
+
+            def counting_enqueue(msg):
+                self.bytes += msg.ByteSize()
+                self._send(msg)
+            ctx._enqueue = counting_enqueue
+        return self
+
+    def __exit__(self, *exc):
+        if self._ctx is not None:
+            self._ctx._enqueue = self._send
+
+
+def instrument_widget(name, fn):
+    """Wraps a widget function so each run records fetch/render time, rows and bytes sent."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        fetch0 = getattr(_local, "fetch", 0.0)
+        rows0 = getattr(_local, "rows", 0)
+        calls0 = getattr(_local, "calls", 0)
+        start = time.perf_counter()
+        with _ByteCounter() as sent:
+            result = fn(*args, **kwargs)
+        total = time.perf_counter() - start
+        fetch = getattr(_local, "fetch", 0.0) - fetch0
+        fetched = getattr(_local, "calls", 0) > calls0
+        waited = getattr(_local, "prefetched", {}).pop(name, None)
+        rows = sum(r for r in map(rows_of, args) if r is not None) + getattr(_local, "rows", 0) - rows0
+        METRICS.observe(
+            "widget", name,
+            fetch_seconds=fetch + (waited or 0.0) if fetched or waited is not None else None,
+            render_seconds=total - fetch,
+            rows=rows if (args or fetched) else None,
+            bytes_sent=sent.bytes,
+        )
+        return result
+    return wrapper
+
+
+@contextmanager
+def prefetched(widget, seconds):
+    """Hands a prefetch wait to the run of ``widget`` inside the block, which reports
+    it as part of its fetch time (one observation per run)."""
+    pending = _local.__dict__.setdefault("prefetched", {})
+    pending[widget] = seconds
+    try:
+        yield
+    finally:
+        pending.pop(widget, None)
+
+
+def record_fetch(widget, seconds):
+    """Records a data wait for a widget that did not run (its data timed out or failed)."""
+    METRICS.observe("widget", widget, fetch_seconds=seconds)
+
+
+# --- EXPORT ---
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """All metrics, plus the provider cache counters, in Prometheus text format."""
+    from data_cache import cache_stats
+
+    by_metric = {}
+    for (kind, name, metric), s in METRICS.series():
+        by_metric.setdefault((kind, metric), []).append((name, s))
+    lines = []
+    for (kind, metric), rows in by_metric.items():
+        full = f"{PREFIX}_{kind}_{metric}"
+        lines += [f"# HELP {full} {HELP.get((kind, metric), metric)}", f"# TYPE {full} summary"]
+        for name, s in rows:
+            lines.append(f'{full}_count{{{kind}="{_label(name)}"}} {s["count"]}')
+            lines.append(f'{full}_sum{{{kind}="{_label(name)}"}} {s["sum"]:.6g}')
+
+    stats = cache_stats()
+    for counter in ("hits", "misses", "evictions"):
+        full = f"{PREFIX}_cache_{counter}_total"
+        lines += [f"# HELP {full} Provider cache {counter}.", f"# TYPE {full} counter"]
+        lines += [f'{full}{{provider="{_label(p)}"}} {s[counter]}' for p, s in sorted(stats.items())]
+    full = f"{PREFIX}_cache_bytes"
+    lines += [f"# HELP {full} Bytes held in the provider cache.", f"# TYPE {full} gauge"]
+    lines += [f'{full}{{provider="{_label(p)}"}} {s["bytes"]}' for p, s in sorted(stats.items())]
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path=METRICS_FILE):
+    """Atomically writes the metrics to ``path`` (a no-op when no path is configured)."""
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def serve(port=METRICS_PORT, host="127.0.0.1"):
+    """Starts the ``/metrics`` endpoint once per process and returns the server.
+
+    If the port cannot be bound (e.g. already in use) this warns once and
+    returns None from then on, instead of retrying on every rerun.
+    """
+    global _server, _server_failed
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as exc:
+                _server_failed = True
+                log.warning("metrics endpoint disabled: cannot listen on %s:%s (%s)", host, port, exc)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        return _server
+
+
+def export():
+    """Publishes the metrics to whichever of the file and endpoint is configured."""
+    write_textfile()
+    serve()
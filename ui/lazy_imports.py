@@ -0,0 +1,36 @@
+"""Lazy module proxies for heavy imports.
+
+``px = lazy("plotly.express")`` binds a placeholder module; the real import
+happens on first attribute access, so pages that never draw a chart never pay
+for plotly. After loading, the proxy's namespace is filled in and later lookups
+are plain attribute reads.
+"""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_loaded"] = False
+
+    def _load(self):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        self.__dict__["_lazy_loaded"] = True
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_loaded else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy(name):
+    """Returns the module if it is already imported, otherwise a lazy proxy for it."""
+    return sys.modules.get(name) or LazyModule(name)
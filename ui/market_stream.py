@@ -0,0 +1,356 @@
+"""Live market-data streaming mode for the Investment Info widgets.
+
+    python ui/market_stream.py bench [--ticks N]   # ingest throughput
+
+A ``SimulatedTickSource`` produces trades (ticker, price, signed notional) for
+a small ticker universe. ``MarketStream`` ingests them in vectorized batches
+on a background thread and keeps:
+
+* a ring buffer of the last ``RING_SIZE`` prices per ticker (the sparklines)
+* incremental aggregates per ticker: last price, % change vs previous close,
+  buy / sell / net flow since the stream started ($M)
+* cap-weighted sector returns, updated from the per-batch change deltas
+* a version number per ticker, bumped whenever a batch touches it
+
+The stream is process-wide: one ingest thread feeds every session, and it only
+runs while some session is live. Sessions ``subscribe`` when they turn live mode
+on and on every refresh, and ``unsubscribe`` when they turn it off. The thread
+stops once no subscriber has been seen for ``IDLE_SECONDS`` (closed tabs never
+unsubscribe). Each session reads the stream through a ``StreamView``, which
+starts from the static provider table and on every refresh writes only the rows
+whose ticker version moved since that session's last refresh; the sector heatmap
+reads ``heatmap_frame``. The widgets are fragments with
+``run_every=REFRESH_SECONDS``, so a refresh reruns only those widgets, never
+the page.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import METRICS
+
+# --- SETTINGS ---
+
+TICK_RATE = int(os.environ.get("PB_TICK_RATE", "2000"))  # simulated ticks per second
+BATCH_SECONDS = 0.05  # ingest interval of the background thread
+RING_SIZE = 256  # prices kept per ticker
+TREND_POINTS = 60  # prices shown in a sparkline
+REFRESH_SECONDS = float(os.environ.get("PB_STREAM_REFRESH", "2"))  # widget refresh interval
+STREAM_DEFAULT = os.environ.get("PB_MARKET_STREAM", "0") == "1"  # live mode on by default
+IDLE_SECONDS = max(3 * REFRESH_SECONDS, 10.0)  # a subscriber not seen for this long is dropped
+
+# Ticker universe: sector, previous close, opening % change and market weight
+# (its share of the ticks and the heatmap tile size). Opening moves match the static briefing tables.
+UNIVERSE = pd.DataFrame([
+    ("NVDA", "Technology", 880.0, 3.2, 22.0),
+    ("AAPL", "Technology", 185.0, 0.5, 25.0),
+    ("MSFT", "Technology", 410.0, 0.8, 24.0),
+    ("TSLA", "Consumer Disc", 240.0, -1.5, 8.0),
+    ("AMZN", "Consumer Disc", 175.0, 1.1, 15.0),
+    ("JPM", "Financials", 195.0, 0.3, 9.0),
+    ("UNH", "Healthcare", 520.0, -0.4, 7.0),
+    ("XOM", "Energy", 118.0, 2.4, 7.5),
+    ("LIN", "Materials", 460.0, 0.2, 3.0),
+    ("CAT", "Industrials", 350.0, 0.6, 4.5),
+    ("NEE", "Utilities", 68.0, -0.2, 2.5),
+    ("LQD", "Fixed Income", 108.0, 0.3, 5.0),
+], columns=["Ticker", "Sector", "Close", "Open Chg%", "Market Weight"])
+
+# Heatmap sectors (as in mock_data.get_market_heatmap_data); other tickers are left out
+SECTORS = [
+    "Technology", "Financials", "Healthcare", "Consumer Disc",
+    "Energy", "Materials", "Industrials", "Utilities",
+]
+
+# Aggregate fields a StreamView can map onto table columns
+FIELDS = ("last", "chg", "buy", "sell", "net")
+
+
+# --- TICK SOURCE ---
+
+class SimulatedTickSource:
+    """Random-walk trades for ``universe``; batches are (ticker, price, notional $M)."""
+
+    def __init__(self, universe=UNIVERSE, seed=None, tick_vol=0.0004):
+        self._rng = np.random.default_rng(seed)
+        start = universe["Close"].to_numpy() * (1 + universe["Open Chg%"].to_numpy() / 100)
+        self._log_price = np.log(start)
+        self._weights = universe["Market Weight"].to_numpy() / universe["Market Weight"].sum()
+        self._tick_vol = tick_vol
+
+    def next_batch(self, n):
+        rng = self._rng
+        ticker = rng.choice(len(self._log_price), size=n, p=self._weights).astype(np.int32)
+        step = rng.normal(0.0, self._tick_vol, n)
+        # Each tick moves its own ticker's price; cumulative within the batch, in tick order
+        order = np.argsort(ticker, kind="stable")
+        sorted_ticker = ticker[order]
+        starts = np.flatnonzero(np.r_[True, sorted_ticker[1:] != sorted_ticker[:-1]])
+        walk = np.cumsum(step[order])
+        walk -= np.repeat(walk[starts] - step[order][starts], np.diff(np.r_[starts, n]))
+        log_price = np.empty(n)
+        log_price[order] = self._log_price[sorted_ticker] + walk
+        ends = np.r_[starts[1:], n] - 1
+        self._log_price[sorted_ticker[ends]] = log_price[order][ends]
+        # Buyer-initiated when the tick moved the price up; sizes in $M
+        notional = rng.lognormal(-1.5, 0.8, n) * np.sign(step)
+        return ticker, np.exp(log_price).astype(np.float32), notional.astype(np.float32)
+
+
+# --- STREAM ---
+
+class MarketStream:
+    """Per-ticker ring buffers and incremental aggregates fed from a tick source."""
+
+    def __init__(self, universe=UNIVERSE, source=None, ring_size=RING_SIZE):
+        self.universe = universe.reset_index(drop=True)
+        self.tickers = self.universe["Ticker"].tolist()
+        self.index = {t: i for i, t in enumerate(self.tickers)}
+        self.source = source or SimulatedTickSource(self.universe)
+        n = len(self.tickers)
+        self._lock = threading.Lock()
+        self._ring = np.zeros((n, ring_size), dtype=np.float32)
+        self._count = np.zeros(n, dtype=np.int64)  # ticks ever written per ticker
+        self._close = self.universe["Close"].to_numpy(dtype=np.float64)
+        self._last = self._close * (1 + self.universe["Open Chg%"].to_numpy() / 100)
+        self._chg = (self._last / self._close - 1) * 100
+        self._buy = np.zeros(n)
+        self._sell = np.zeros(n)
+        self._versions = np.zeros(n, dtype=np.int64)
+        self.version = 0
+        self.ticks = 0
+        # Sector returns: running sum of weight * chg per sector, divided by sector weight
+        self._sector = np.array([SECTORS.index(s) if s in SECTORS else -1 for s in self.universe["Sector"]])
+        self._in_sector = self._sector >= 0
+        self._cap = self.universe["Market Weight"].to_numpy(dtype=np.float64)
+        self._sector_weight = np.bincount(self._sector[self._in_sector], self._cap[self._in_sector], len(SECTORS))
+        self._sector_sum = np.bincount(
+            self._sector[self._in_sector], (self._cap * self._chg)[self._in_sector], len(SECTORS))
+        self._subscribers = {}  # session key -> last seen (time.monotonic)
+        self._thread = None
+        self._stop = threading.Event()
+
+    # --- Ingest ---
+    def ingest(self, ticker, price, notional):
+        """Applies one batch of ticks (parallel arrays, in arrival order)."""
+        n = len(self.tickers)
+        if not len(ticker):
+            return
+        order = np.argsort(ticker, kind="stable")
+        t = ticker[order]
+        counts = np.bincount(t, minlength=n)
+        starts = np.r_[0, np.cumsum(counts)[:-1]]
+        rank = np.arange(len(t)) - starts[t]
+        touched = np.flatnonzero(counts)
+        last_tick = order[starts[touched] + counts[touched] - 1]
+        buys = np.bincount(ticker, np.maximum(notional, 0), n)
+        sells = np.bincount(ticker, np.maximum(-notional, 0), n)
+        with self._lock:
+            self._ring[t, (self._count[t] + rank) % self._ring.shape[1]] = price[order]
+            self._count += counts
+            self._last[touched] = price[last_tick]
+            chg = (self._last[touched] / self._close[touched] - 1) * 100
+            moved = touched[self._in_sector[touched]]
+            delta = (chg - self._chg[touched])[self._in_sector[touched]]
+            self._sector_sum += np.bincount(self._sector[moved], self._cap[moved] * delta, len(SECTORS))
+            self._chg[touched] = chg
+            self._buy += buys
+            self._sell += sells
+            self.version += 1
+            self._versions[touched] = self.version
+            self.ticks += len(ticker)
+
+    def _run(self, stop):
+        per_batch = max(int(TICK_RATE * BATCH_SECONDS), 1)
+        next_at = time.monotonic()
+        while not stop.is_set() and self._keep_running(stop):
+            start = time.perf_counter()
+            self.ingest(*self.source.next_batch(per_batch))
+            METRICS.observe("stream", "market", ticks=per_batch, ingest_seconds=time.perf_counter() - start)
+            next_at += BATCH_SECONDS
+            stop.wait(max(next_at - time.monotonic(), 0))
+
+    def _keep_running(self, stop):
+        """Drops subscribers idle for IDLE_SECONDS; retires the thread once none remain."""
+        cutoff = time.monotonic() - IDLE_SECONDS
+        with self._lock:
+            for key in [k for k, seen in self._subscribers.items() if seen < cutoff]:
+                del self._subscribers[key]
+            if not self._subscribers:
+                stop.set()  # decided under the lock, so a new subscribe starts a fresh thread
+                self._thread = None
+            return not stop.is_set()
+
+    def subscribe(self, key):
+        """Marks session ``key`` live (call again on every refresh) and starts ingesting."""
+        with self._lock:
+            self._subscribers[key] = time.monotonic()
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name="market-stream",
+                                                daemon=True)
+                self._thread.start()
+        return self
+
+    def unsubscribe(self, key):
+        """Session ``key`` left live mode; stops the ingest thread if it was the last one."""
+        with self._lock:
+            self._subscribers.pop(key, None)
+            last = not self._subscribers
+        if last:
+            self.stop()
+
+    def stop(self):
+        """Stops ingesting now; the next ``subscribe`` starts again."""
+        with self._lock:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    @property
+    def running(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    # --- Reads ---
+    def changes(self, since):
+        """``(version, ticker indices updated after version since, {field: values})``."""
+        with self._lock:
+            rows = np.flatnonzero(self._versions > since)
+            return self.version, rows, self._fields(rows)
+
+    def _fields(self, rows):
+        return {
+            "last": self._last[rows].copy(),
+            "chg": self._chg[rows].copy(),
+            "buy": self._buy[rows].copy(),
+            "sell": self._sell[rows].copy(),
+            "net": self._buy[rows] - self._sell[rows],
+        }
+
+    def trends(self, rows, points=TREND_POINTS):
+        """Last ``points`` prices of each ticker in ``rows``, oldest first (lists for LineChartColumn)."""
+        size = self._ring.shape[1]
+        points = min(points, size)
+        with self._lock:
+            count = self._count[rows]
+            offsets = count[:, None] - points + np.arange(points)
+            window = self._ring[np.asarray(rows)[:, None], offsets % size]
+        return [w[max(points - int(c), 0):].tolist() for w, c in zip(window, count)]
+
+    def sector_returns(self):
+        """Cap-weighted % change per sector, in ``SECTORS`` order."""
+        with self._lock:
+            return self._sector_sum / np.where(self._sector_weight > 0, self._sector_weight, 1)
+
+    def heatmap_frame(self):
+        """Live counterpart of ``mock_data.get_market_heatmap_data``."""
+        returns = self.sector_returns()
+        return pd.DataFrame({
+            "Sector": SECTORS,
+            "Return (%)": np.round(returns, 2),
+            "Market Weight": self._sector_weight,
+            "Color Score": returns,
+        })
+
+    def stats(self):
+        return {"ticks": self.ticks, "version": self.version, "running": self.running,
+                "subscribers": len(self._subscribers)}
+
+
+_stream = None
+_stream_lock = threading.Lock()
+
+
+def get_market_stream():
+    """Returns the process-wide stream (ingesting only while sessions are subscribed)."""
+    global _stream
+    if _stream is None:
+        with _stream_lock:
+            if _stream is None:
+                _stream = MarketStream()
+    return _stream
+
+
+# --- SESSION VIEWS ---
+
+# Static table column -> (stream field, additive). Additive columns are the
+# provider's value plus the flow since the stream started; others are replaced.
+BRIEFING_FIELDS = {
+    "Buy Pre": ("buy", True), "Buy Wk": ("buy", True),
+    "Sell Pre": ("sell", True), "Sell Wk": ("sell", True),
+    "NetBuy": ("net", True), "Chg%": ("chg", False),
+}
+MOVER_FIELDS = {"Move": ("chg", False)}
+TRADE_REVIEW_FIELDS = {"Post-Move": ("chg", False)}
+
+
+class StreamView:
+    """One session's live copy of a provider table, patched row by row from the stream."""
+
+    def __init__(self, stream, base, fields, key="Ticker", trend=None):
+        self.stream = stream
+        self.fields = {c: f for c, f in fields.items() if c in base.columns}
+        self.frame = base.reset_index(drop=True).copy()
+        if trend:
+            self.frame[trend] = [[] for _ in range(len(self.frame))]
+        self.trend = trend
+        self._base = {c: self.frame[c].to_numpy(dtype=np.float64) for c in self.fields}
+        self._positions = {c: self.frame.columns.get_loc(c) for c in [*self.fields, *([trend] if trend else [])]}
+        # stream ticker index -> frame row (-1: ticker not in this table)
+        self._row_of = np.full(len(stream.tickers), -1)
+        for row, key_value in enumerate(self.frame[key].astype(str)):
+            if key_value in stream.index:
+                self._row_of[stream.index[key_value]] = row
+        self.version = -1
+        self.rows_changed = 0
+
+    def refresh(self):
+        """Applies the rows changed since the last refresh; returns the frame."""
+        version, tickers, values = self.stream.changes(self.version)
+        rows = self._row_of[tickers]
+        hit = rows >= 0
+        rows, tickers = rows[hit], tickers[hit]
+        self.version, self.rows_changed = version, len(rows)
+        if not len(rows):
+            return self.frame
+        for col, (field, additive) in self.fields.items():
+            new = values[field][hit]
+            if additive:
+                new = self._base[col][rows] + new
+            self.frame.iloc[rows, self._positions[col]] = new.astype(self.frame[col].dtype)
+        if self.trend:
+            for row, points in zip(rows, self.stream.trends(tickers)):
+                self.frame.iat[row, self._positions[self.trend]] = points
+        return self.frame
+
+
+# --- CLI ---
+
+def bench(ticks=1_000_000, batch=int(TICK_RATE * BATCH_SECONDS)):
+    stream = MarketStream(source=SimulatedTickSource(seed=0))
+    batches = [stream.source.next_batch(batch) for _ in range(max(ticks // batch, 1))]
+    start = time.perf_counter()
+    for b in batches:
+        stream.ingest(*b)
+    seconds = time.perf_counter() - start
+    return stream.ticks, seconds
+
+
+def main(argv):
+    if argv[:1] == ["bench"]:
+        ticks = int(argv[argv.index("--ticks") + 1]) if "--ticks" in argv else 1_000_000
+        n, seconds = bench(ticks)
+        print(f"{n:,} ticks in {seconds:.2f}s  ({n / seconds:,.0f} ticks/s ingest)")
+        return 0
+    print(__doc__.split("\n\n")[1])
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,142 @@
+"""Client x product suitability matching.
+
+Scores every client against every product in one vectorized pass over
+client chunks of ``CHUNK_SIZE`` clients, so memory stays at one
+``(n_products, CHUNK_SIZE)`` float32 block however large the book is. A
+client-product pair scores:
+
+* the client's allocation gap in the product's asset class (target weight
+  for the client's risk profile minus current weight; underweight > 0)
+* plus ``PREFERENCE_BONUS`` per mandate flag the client prefers and the product has
+* minus ``RISK_STEP`` per risk level the product sits below the client's profile
+
+Pairs are unsuitable (-inf) when the product is riskier than the client's
+profile or has a flag the client's mandate excludes. Risk and mandate terms
+are one lookup table indexed by (client code, product code), so the inner
+loop is two gathers and an add. Counts of pairs above ``MATCH_THRESHOLD`` and
+a running top-K per product are folded in chunk by chunk.
+"""
+import numpy as np
+
+# --- SETTINGS ---
+
+CHUNK_SIZE = 8192  # clients per block
+TOP_K = 5
+MATCH_THRESHOLD = 0.02  # minimum score for a client to count as a match
+PREFERENCE_BONUS = 0.03
+RISK_STEP = 0.01
+
+# Mandate flags (one bit each): products carry them, clients prefer or exclude them.
+MANDATE_FLAGS = ["ESG", "INCOME", "EM", "LEVERAGE"]
+MANDATE_BITS = {f: np.uint8(1 << i) for i, f in enumerate(MANDATE_FLAGS)}
+
+# Target allocation per risk profile (rows follow mock_data.RISK_PROFILES, columns ASSET_CLASSES)
+RISK_TARGETS = np.array([
+    [0.20, 0.65, 0.05, 0.10],  # Conservative
+    [0.30, 0.55, 0.10, 0.05],  # Moderate
+    [0.40, 0.40, 0.15, 0.05],  # Balanced
+    [0.55, 0.25, 0.15, 0.05],  # Growth
+    [0.70, 0.10, 0.17, 0.03],  # Aggressive
+], dtype=np.float32)
+
+_N_FLAGS = 1 << len(MANDATE_FLAGS)
+
+
+def allocation_gaps(risk_profile, weights):
+    """``(N, len(ASSET_CLASSES))`` target-minus-current weights; positive means underweight."""
+    return RISK_TARGETS[risk_profile] - weights
+
+
+def client_codes(risk_profile, preferred, excluded):
+    """One small int per client combining risk profile and mandate bits."""
+    return (risk_profile.astype(np.int32) * _N_FLAGS + preferred) * _N_FLAGS + excluded
+
+
+def product_codes(risk, flags):
+    return risk.astype(np.int32) * _N_FLAGS + flags
+
+
+def suitability_table():
+    """``(client code, product code) -> score term``: risk step and mandate bonus, -inf if unsuitable."""
+    n_risk = len(RISK_TARGETS)
+    c_risk, pref, excl = np.unravel_index(np.arange(n_risk * _N_FLAGS * _N_FLAGS), (n_risk, _N_FLAGS, _N_FLAGS))
+    p_risk, flags = np.unravel_index(np.arange(n_risk * _N_FLAGS), (n_risk, _N_FLAGS))
+    popcount = np.array([bin(i).count("1") for i in range(_N_FLAGS)])
+    table = (PREFERENCE_BONUS * popcount[pref[:, None] & flags[None, :]]
+             - RISK_STEP * (c_risk[:, None] - p_risk[None, :]))
+    unsuitable = (p_risk[None, :] > c_risk[:, None]) | ((excl[:, None] & flags[None, :]) != 0)
+    return np.where(unsuitable, -np.inf, table).astype(np.float32)
+
+
+def _top_per_row(score, idx, k):
+    """Best ``k`` of each row of candidate blocks, best first; pads with (-inf, -1).
+
+    ``idx`` ascends along each row; clients tied at the cutoff are kept in that order.
+    """
+    n_rows, n = score.shape
+    top = np.full((n_rows, k), -np.inf, dtype=np.float32)
+    top_idx = np.full((n_rows, k), -1, dtype=np.int64)
+    m = min(k, n)
+    if m:
+        if m < n:
+            kth = np.take_along_axis(score, np.argpartition(-score, m - 1, axis=1)[:, m - 1:m], 1)
+            better, tied = score > kth, score == kth
+            keep = better | (tied & (np.cumsum(tied, axis=1) <= m - better.sum(axis=1, keepdims=True)))
+            part = np.nonzero(keep)[1].reshape(n_rows, m)
+        else:
+            part = np.broadcast_to(np.arange(n), (n_rows, n))
+        top[:, :m] = np.take_along_axis(score, part, 1)
+        top_idx[:, :m] = np.take_along_axis(idx, part, 1)
+    order = np.lexsort((top_idx, -top), axis=1)
+    return np.take_along_axis(top, order, 1), np.take_along_axis(top_idx, order, 1)
+
+
+def _merge_candidates(top, top_idx, rows, clients, scores, k):
+    """Folds sparse (product row, client, score) candidates into the running top-k."""
+    n_rows = len(top)
+    rows = np.r_[np.repeat(np.arange(n_rows), k), rows]
+    clients = np.r_[top_idx.ravel(), clients]
+    scores = np.r_[top.ravel(), scores]
+    order = np.lexsort((clients, -scores, rows))
+    rows, clients, scores = rows[order], clients[order], scores[order]
+    starts = np.searchsorted(rows, np.arange(n_rows))
+    take = (starts[:, None] + np.arange(k)).ravel()  # every row has at least its k running entries
+    return scores[take].reshape(n_rows, k), clients[take].reshape(n_rows, k)
+
+
+def match_products(codes, gaps, product_code, product_class, k=TOP_K,
+                   threshold=MATCH_THRESHOLD, chunk_size=CHUNK_SIZE):
+    """Matches clients to products; returns ``(counts, top_idx, top_score)``.
+
+    ``counts[p]`` is the number of clients scoring above ``threshold`` for
+    product p; ``top_idx[p]`` the (up to) ``k`` best of them, best first,
+    padded with -1, and ``top_score`` their scores.
+
+    Blocks are laid out (products, clients) so every per-product reduction
+    runs along contiguous memory. After the first block only scores above a
+    product's current k-th best are candidates, so later blocks cost one
+    comparison pass plus a handful of survivors.
+    """
+    table = np.ascontiguousarray(suitability_table()[:, product_code].T)  # (products, client codes)
+    n_products = len(product_code)
+    counts = np.zeros(n_products, dtype=np.int64)
+    top = top_idx = None
+    for start in range(0, len(codes), chunk_size):
+        stop = min(start + chunk_size, len(codes))
+        score = np.take(table, codes[start:stop], axis=1)
+        score += gaps[start:stop].T[product_class]
+        counts += np.count_nonzero(score > threshold, axis=1)
+        if top is None:
+            idx = np.broadcast_to(np.arange(start, stop), score.shape)
+            top, top_idx = _top_per_row(score, idx, k)
+        else:
+            floor = np.maximum(top[:, -1], threshold)
+            rows, cols = np.nonzero(score > floor[:, None])
+            if len(rows):
+                top, top_idx = _merge_candidates(top, top_idx, rows, cols + start, score[rows, cols], k)
+    if top is None:
+        return counts, np.full((n_products, 0), -1, dtype=np.int64), np.empty((n_products, 0), dtype=np.float32)
+    m = min(k, len(codes))
+    top, top_idx = top[:, :m], top_idx[:, :m].copy()
+    top_idx[~(top > threshold)] = -1
+    return counts, top_idx, top
@@ -1,83 +1,264 @@
+import hashlib
+import os
 from datetime import datetime
 import pandas as pd
 import numpy as np
-import random
+from data_cache import cached
+from snapshots import snapshotted
+from highlight import PRIORITY_BANDS, with_bands
+from scoring import score_book, priority_frame, query_priority, top_k as top_k_indices
+from risk_engine import FACTORS, TARGET_EXPOSURE, compute_book_risk, drift_flags, drift_matrix
+from matching import MANDATE_BITS, allocation_gaps, client_codes, match_products, product_codes
 
 # --- MOCK DATA GENERATORS ---
+# Every provider is wrapped in the shared TTL + LRU cache (see data_cache.py);
+# results are shared across reruns and sessions and must not be mutated.
+# Providers marked @snapshotted are read from memory-mapped Arrow snapshots
+# when `python ui/snapshots.py write` has produced them (see snapshots.py).
 
-def get_mock_priority_list():
-    """Generates the PB Command Center priority list."""
-    clients = [
-        {"id": "c101", "name": "Arthur Pendragon", "score": 95, "aum": 15000000},
-        {"id": "c102", "name": "Guinevere Leodegrance", "score": 88, "aum": 8500000},
-        {"id": "c103", "name": "Lancelot du Lac", "score": 75, "aum": 22000000},
-        {"id": "c104", "name": "Merlin Ambrosius", "score": 40, "aum": 5000000},
-        {"id": "c105", "name": "Morgan le Fay", "score": 30, "aum": 12000000},
-    ]
-    
-    reasons = [
-        {"code": "RISK_DRIFT", "label": "Risk Drift > 5%", "severity": "high"},
-        {"code": "LIQUIDITY", "label": "Cash Drag (15%)", "severity": "medium"},
-        {"code": "MATURITY", "label": "Bond Maturity (30d)", "severity": "medium"},
-        {"code": "NEWS", "label": "Tech Sector Volatility", "severity": "low"},
-    ]
-    
-    data = []
-    for c in clients:
-        # Assign random reasons based on score
-        c_reasons = []
-        if c['score'] > 80:
-            c_reasons = [reasons[0]]
-        elif c['score'] > 60:
-            c_reasons = [reasons[1], reasons[2]]
-        
-        data.append({
-            "client_id": c["id"],
-            "client_name": c["name"],
-            "priority_score": c["score"],
-            "aum_usd": c["aum"],
-            "reason_tags": [r["label"] for r in c_reasons],
-            "last_contact": f"{random.randint(2, 30)} days ago",
-            "next_action": "Call" if c['score'] > 80 else "Email"
-        })
-    
-    return pd.DataFrame(data).sort_values("priority_score", ascending=False)
+# --- CLIENT BOOK ---
+
+# Named demo clients; larger books are padded with synthetic clients.
+DEMO_CLIENTS = [
+    {"id": "c101", "name": "Arthur Pendragon", "score": 95, "aum": 15000000, "risk_profile": "Aggressive"},
+    {"id": "c102", "name": "Guinevere Leodegrance", "score": 88, "aum": 8500000, "risk_profile": "Balanced"},
+    {"id": "c103", "name": "Lancelot du Lac", "score": 75, "aum": 22000000, "risk_profile": "Growth"},
+    {"id": "c104", "name": "Merlin Ambrosius", "score": 40, "aum": 5000000, "risk_profile": "Conservative"},
+    {"id": "c105", "name": "Morgan le Fay", "score": 30, "aum": 12000000, "risk_profile": "Aggressive"},
+]
+RISK_PROFILES = ["Conservative", "Moderate", "Balanced", "Growth", "Aggressive"]
+BOOK_SEED = 20260101
+# Set PB_BOOK_SIZE to run the dashboard against a large synthetic book.
+BOOK_SIZE = int(os.environ.get("PB_BOOK_SIZE", "0")) or None
+
+@cached("book")
+@snapshotted("book", "columns")
+def get_mock_book(size=None):
+    """Generates the client book as column arrays (one entry per client)."""
+    size = max(size or len(DEMO_CLIENTS), len(DEMO_CLIENTS))
+    n_demo = len(DEMO_CLIENTS)
+    n_synth = size - n_demo
+    rng = np.random.default_rng(BOOK_SEED)
+
+    client_id = np.array([c["id"] for c in DEMO_CLIENTS] + [f"c{200000 + i}" for i in range(n_synth)], dtype=object)
+    client_name = np.array([c["name"] for c in DEMO_CLIENTS] + [f"Client {i:06d}" for i in range(1, n_synth + 1)], dtype=object)
+    score = np.empty(size, dtype=np.int16)
+    score[:n_demo] = [c["score"] for c in DEMO_CLIENTS]
+    score[n_demo:] = rng.integers(0, 101, n_synth)
+    aum = np.empty(size, dtype=np.float64)
+    aum[:n_demo] = [c["aum"] for c in DEMO_CLIENTS]
+    aum[n_demo:] = np.round(rng.lognormal(15.5, 0.8, n_synth), -3)
+    last_contact = rng.integers(2, 31, size).astype(np.int16)
+    # Risk profiles are stored as codes into RISK_PROFILES
+    profile = np.empty(size, dtype=np.int8)
+    profile[:n_demo] = [RISK_PROFILES.index(c["risk_profile"]) for c in DEMO_CLIENTS]
+    profile[n_demo:] = rng.integers(0, len(RISK_PROFILES), n_synth)
+
+    return {
+        "client_id": client_id,
+        "client_name": client_name,
+        "priority_score": score,
+        "aum_usd": aum,
+        "last_contact_days": last_contact,
+        "risk_profile": profile,
+    }
+
+def _score_book(book, book_size):
+    from events import today  # events imports this module
+    return score_book(book, drift_flags(get_book_risk(book_size)["drift_norm"]),
+                      get_maturity_flags(str(today()), book_size))
+
+@cached("priority_list")
+def get_mock_priority_list(top_k=None, book_size=BOOK_SIZE):
+    """Generates the PB Command Center priority list (top ``top_k`` clients, best first)."""
+    book = get_mock_book(book_size)
+    scores, masks = _score_book(book, book_size)
+    return priority_frame(book, top_k_indices(scores, top_k), scores, masks)
+
+@cached("priority_page")
+def get_priority_page(sort_by="priority_score", descending=True, reason=None, client_ids=None,
+                      offset=0, limit=25, book_size=BOOK_SIZE, score_range=None, aum_range=None):
+    """One page of the priority list, filtered and sorted server-side. Returns ``(df, total)``.
+
+    ``score_range`` and ``aum_range`` are inclusive ``(lo, hi)`` bounds (None = open).
+    ``client_ids`` (a frozenset, e.g. a group's members) restricts the list to
+    those clients; the mask is built from registry positions in O(group size).
+    """
+    from client_registry import get_registry  # client_registry imports this module
+    book = get_mock_book(book_size)
+    scores, masks = _score_book(book, book_size)
+    return priority_page(book, scores, masks, get_registry(book_size), sort_by, descending, reason,
+                         client_ids, offset, limit, score_range, aum_range)
+
+def priority_page(book, scores, masks, registry, sort_by="priority_score", descending=True, reason=None,
+                  client_ids=None, offset=0, limit=25, score_range=None, aum_range=None):
+    """Pages a scored book (any provider's); see ``get_priority_page`` for the arguments."""
+    include = None
+    if client_ids is not None:
+        include = np.zeros(len(registry), dtype=bool)
+        include[registry.positions(c for c in client_ids if c in registry)] = True
+    idx, total = query_priority(book, scores, masks, sort_by, descending, reason, score_range, aum_range,
+                                include, offset, limit)
+    return with_bands(priority_frame(book, idx, scores, masks), PRIORITY_BANDS), total
+
+# --- PER-CLIENT RANDOM STREAMS ---
+# Every client gets its own reproducible stream: a 64-bit key derived from the
+# book SeedSequence and the client id, expanded with a counter-based mixer.
+# Because draw j for a client depends only on (key, stream, j), a whole book is
+# generated in one vectorized pass and any single client can be regenerated alone.
+
+_ROOT_KEY = int(np.random.SeedSequence(BOOK_SEED).generate_state(1, dtype=np.uint64)[0])
+
+def _splitmix64(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def client_keys(client_ids):
+    """Stable 64-bit key per client id."""
+    digests = b"".join(
+        hashlib.blake2b(str(cid).encode(), digest_size=8, key=_ROOT_KEY.to_bytes(8, "little")).digest()
+        for cid in client_ids
+    )
+    return np.frombuffer(digests, dtype=np.uint64).copy()
+
+def client_uniforms(client_ids, stream, n):
+    """``(len(client_ids), n)`` uniform draws in (0, 1) from each client's ``stream``."""
+    stream_key = int.from_bytes(hashlib.blake2b(stream.encode(), digest_size=8).digest(), "little")
+    keys = client_keys(client_ids)
+    counters = _splitmix64(np.arange(n, dtype=np.uint64) + np.uint64(stream_key))
+    bits = _splitmix64(keys[:, None] ^ counters[None, :])
+    return ((bits >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0 ** -53  # 53-bit uniforms
 
+def client_normals(client_ids, stream, n):
+    """``(len(client_ids), n)`` standard normal draws from each client's ``stream``."""
+    u = client_uniforms(client_ids, stream, 2 * n)
+    u1, u2 = u[:, :n], u[:, n:]  # Box-Muller
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+# --- PORTFOLIOS ---
+
+ASSET_CLASSES = ["Equities", "Fixed Income", "Alternatives", "Cash"]
+BASE_WEIGHTS = np.array([0.4, 0.4, 0.15, 0.05], dtype=np.float32)
+PORTFOLIO_VALUE = 10000000  # Assume 10m portfolio
+
+def get_mock_portfolios(client_ids):
+    """Generates allocations for many clients at once.
+
+    Returns ``(weights, values)``: two ``(N, len(ASSET_CLASSES))`` float32 matrices,
+    one row per client id in input order.
+    """
+    noise = client_normals(client_ids, "portfolio", len(ASSET_CLASSES)).astype(np.float32)
+    weights = np.maximum(BASE_WEIGHTS + np.float32(0.05) * noise, np.float32(0))
+    weights /= weights.sum(axis=1, keepdims=True)  # normalize
+    return weights, weights * np.float32(PORTFOLIO_VALUE)
+
+@cached("book_portfolios")
+def get_book_portfolios(book_size=BOOK_SIZE):
+    """Allocation matrix for the whole book, rows in book order."""
+    return get_mock_portfolios(get_mock_book(book_size)["client_id"])
+
+@cached("portfolio")
 def get_mock_portfolio(client_id):
     """Generates a mock portfolio composition."""
-    # Fixed seed for consistency per client
-    random.seed(client_id)
-    
-    asset_classes = ["Equities", "Fixed Income", "Alternatives", "Cash"]
-    weights = [0.4, 0.4, 0.15, 0.05]
-    
-    # Add some noise
-    adj = np.random.normal(0, 0.05, 4)
-    weights = [max(0, w + a) for w, a in zip(weights, adj)]
-    weights = [w / sum(weights) for w in weights] # normalize
-    
+    weights, values = get_mock_portfolios([client_id])
     df = pd.DataFrame({
-        "Asset Class": asset_classes,
-        "Allocation": weights,
-        "Value USD": [w * 10000000 for w in weights]  # Assume 10m portfolio
+        "Asset Class": ASSET_CLASSES,
+        "Allocation": weights[0],
+        "Value USD": values[0]
     })
     return df
 
+# --- HOLDINGS ---
+# Instrument-level equity positions behind the market widgets (see holdings_index.py).
+# Named tickers come first; synthetic ones pad the universe for large books.
+
+HOLDING_TICKERS = ["NVDA", "AAPL", "MSFT", "TSLA", "AMZN", "JPM", "UNH", "XOM", "LIN", "CAT", "NEE", "LQD"]
+INSTRUMENTS = np.array(HOLDING_TICKERS + [f"X{i:05d}" for i in range(20000)], dtype=object)
+HOLDINGS_PER_CLIENT = 8
+EQUITY_SLEEVE = 0.4  # share of AUM held in single lines
+# Demo clients' lines as fractions of their equity sleeve
+DEMO_HOLDINGS = {
+    "c101": {"NVDA": 0.40, "TSLA": 0.35, "MSFT": 0.25},
+    "c102": {"XOM": 0.50, "JPM": 0.30, "LQD": 0.20},
+    "c103": {"NVDA": 0.30, "AMZN": 0.40, "MSFT": 0.30},
+    "c104": {"TSLA": 0.20, "NEE": 0.50, "LQD": 0.30},
+    "c105": {"AMZN": 0.50, "UNH": 0.50},
+}
+
+@cached("book_holdings")
+def get_book_holdings(book_size=BOOK_SIZE):
+    """Single-line positions for the whole book as column arrays.
+
+    ``client`` is the row in the book, ``instrument`` a code into ``INSTRUMENTS``
+    and ``mv_usd`` the market value; one row per (client, instrument).
+    Synthetic clients draw their lines from a Zipf-like popularity curve.
+    """
+    book = get_mock_book(book_size)
+    code = {t: i for i, t in enumerate(HOLDING_TICKERS)}
+    demo = [(pos, code[t], book["aum_usd"][pos] * EQUITY_SLEEVE * w)
+            for pos, cid in enumerate(book["client_id"][:len(DEMO_CLIENTS)])
+            for t, w in DEMO_HOLDINGS.get(cid, {}).items()]
+    client, instrument, mv = (np.array(col) for col in zip(*demo))
+
+    n_synth = len(book["client_id"]) - len(DEMO_CLIENTS)
+    if n_synth:
+        rng = np.random.default_rng(BOOK_SEED + 1)
+        popularity = 1.0 / np.arange(1, len(INSTRUMENTS) + 1) ** 1.1
+        picks = rng.choice(len(INSTRUMENTS), size=(n_synth, HOLDINGS_PER_CLIENT), p=popularity / popularity.sum())
+        shares = rng.gamma(1.0, size=picks.shape)
+        shares /= shares.sum(axis=1, keepdims=True)
+        rows = np.repeat(np.arange(len(DEMO_CLIENTS), len(DEMO_CLIENTS) + n_synth), HOLDINGS_PER_CLIENT)
+        # Repeated picks of one instrument by a client are merged into one line
+        keys, inverse = np.unique(rows.astype(np.int64) * len(INSTRUMENTS) + picks.ravel(), return_inverse=True)
+        values = np.bincount(inverse, (shares * EQUITY_SLEEVE).ravel() * book["aum_usd"][rows])
+        client = np.concatenate([client, keys // len(INSTRUMENTS)])
+        instrument = np.concatenate([instrument, keys % len(INSTRUMENTS)])
+        mv = np.concatenate([mv, values])
+    return {"client": client.astype(np.int32), "instrument": instrument.astype(np.int32), "mv_usd": mv}
+
+# --- RISK EXPOSURE ---
+
+def get_mock_exposures(client_ids):
+    """Current factor exposures, one float32 row per client id (columns follow FACTORS)."""
+    noise = client_normals(client_ids, "risk_exposure", len(FACTORS))
+    return (0.5 + 0.3 * noise).astype(np.float32)
+
+@cached("book_risk")
+def get_book_risk(book_size=BOOK_SIZE):
+    """Exposure, drift, drift norm and drift rank for the whole book (book order)."""
+    return compute_book_risk(get_mock_exposures(get_mock_book(book_size)["client_id"]))
+
+@cached("top_drift")
+def get_top_drift(k=10, book_size=BOOK_SIZE):
+    """Clients with the largest factor drift, largest first."""
+    return drift_table(get_mock_book(book_size), get_book_risk(book_size), k)
+
+def drift_table(book, risk, k):
+    """Top-``k`` factor drift table for a book and its ``compute_book_risk`` result."""
+    idx = top_k_indices(risk["drift_norm"], k)
+    return pd.DataFrame({
+        "client_id": book["client_id"][idx],
+        "client_name": book["client_name"][idx],
+        "drift_norm": risk["drift_norm"][idx],
+        "largest_drift": np.array(FACTORS)[np.abs(risk["drift"][idx]).argmax(axis=1)],
+    })
+
+@cached("risk_exposure")
 def get_mock_risk_exposure(client_id):
     """Generates mock risk factor exposures."""
-    factors = ["Growth", "Value", "Momentum", "Volatility", "Liquidity", "Size"]
-    
-    current_exposure = np.random.normal(0.5, 0.3, len(factors))
-    target_exposure = np.array([0.5, 0.5, 0.5, 0.0, 0.8, 0.2])
+    current_exposure = get_mock_exposures([client_id])[0]
     
     df = pd.DataFrame({
-        "Factor": factors,
+        "Factor": FACTORS,
         "Current Exposure": current_exposure,
-        "Target Exposure": target_exposure,
-        "Drift": current_exposure - target_exposure
+        "Target Exposure": TARGET_EXPOSURE,
+        "Drift": drift_matrix(current_exposure)
     })
     return df
 
+@cached("market_heatmap")
 def get_market_heatmap_data():
     """Generates mock market sector performance for a heatmap."""
     sectors = [
@@ -95,6 +276,7 @@ def get_market_heatmap_data():
         "Color Score": returns # Used for color scale
     })
 
+@cached("aggregated_aum")
 def get_aggregated_aum_data():
     """Generates mock aggregated AUM data for the whole book."""
     assets = ["Equities", "Fixed Income", "Alts", "Cash", "Real Estate"]
@@ -104,6 +286,7 @@ def get_aggregated_aum_data():
         "AUM (M)": values
     })
 
+@cached("risk_distribution")
 def get_risk_distribution_data():
     """Generates mock client count by risk category."""
     categories = ["Low", "Medium-Low", "Medium", "Medium-High", "High"]
@@ -113,6 +296,8 @@ def get_risk_distribution_data():
         "Client Count": counts
     })
 
+@cached("cashflow")
+@snapshotted("cashflow")
 def get_cashflow_data():
     """Generates mock cashflow data for net deposits/outflows."""
     data = [
@@ -124,6 +309,8 @@ def get_cashflow_data():
     ]
     return pd.DataFrame(data)
 
+@cached("high_cash_clients")
+@snapshotted("high_cash_clients")
 def get_high_cash_clients():
     """Generates list of clients with high cash balances."""
     return pd.DataFrame([
@@ -132,50 +319,169 @@ def get_high_cash_clients():
         {"Client": "Bors de Ganis", "Cash ($)": 450000, "Cash %": 18, "Reason": "Risk Averse"},
     ])
 
-def get_churn_risk_data():
-    """Generates clients at risk of leaving."""
-    return pd.DataFrame([
-        {"Client": "Mordred", "Risk Score": "High", "Prob": 85, "Reason": "Performance & Low Contact"},
-        {"Client": "Morgan le Fay", "Risk Score": "Medium", "Prob": 60, "Reason": "Competitor Offer"},
-        {"Client": "Kay Steward", "Risk Score": "Medium", "Prob": 45, "Reason": "Fee Sensitivity"},
-    ])
+def get_churn_features(book_size=BOOK_SIZE):
+    """Churn inputs per client as column arrays (see churn.FEATURES); writable copies."""
+    return churn_features(get_mock_book(book_size))
 
-def get_client_events():
-    """Generates upcoming client life/portfolio events."""
-    return pd.DataFrame([
-        {"Client": "Arthur Pendragon", "Event": "Birthday (60th)", "Date": "2026-01-10", "Action": "Send Gift"},
-        {"Client": "Guinevere Leodegrance", "Event": "Bond Maturity ($1M)", "Date": "2026-01-12", "Action": "Reinvest Proposal"},
-        {"Client": "Lancelot du Lac", "Event": "Retirement Age", "Date": "2026-02-01", "Action": "Financial Plan Review"},
-    ])
+def churn_features(book):
+    """``get_churn_features`` for any book: drawn from per-client streams, so keyed by client id."""
+    noise = client_normals(book["client_id"], "churn", 3)
+    return {
+        "last_contact_days": book["last_contact_days"].astype(np.float32),
+        "excess_return": (3.0 * noise[:, 0]).astype(np.float32),
+        "fee_bps": np.clip(75 + 20 * noise[:, 1], 20, 150).astype(np.float32),
+        "net_flow": (5.0 * noise[:, 2]).astype(np.float32),
+    }
+
+@cached("churn_risk", key_params=("version",))
+def _churn_top(k, book_size):
+    from churn import get_churn_scorer  # churn imports this module
+    return churn_table(get_churn_scorer(book_size), k)
+
+def churn_table(scorer, k):
+    """The churn widget's table: the ``k`` clients of a ``churn.ChurnScorer`` most at risk."""
+    from churn import REASONS, risk_labels
+    idx = scorer.top(k)
+    prob = scorer.prob[idx]
+    return pd.DataFrame({
+        "Client": scorer.client_names[idx],
+        "Risk Score": risk_labels(prob),
+        "Prob": np.rint(prob).astype(np.int16),
+        "Reason": np.array(REASONS, dtype=object)[scorer.reason[idx]],
+    })
+
+def get_churn_risk_data(k=10, book_size=BOOK_SIZE):
+    """Clients most at risk of leaving, scored across the whole book (churn.py).
+
+    Re-scores only clients whose inputs changed since the last call; the
+    table is cached per scorer version, so unchanged calls are cache hits.
+    """
+    from churn import get_churn_scorer  # churn imports this module
+    scorer = get_churn_scorer(book_size)
+    scorer.refresh()
+    return _churn_top(k, book_size, version=scorer.version)
+
+# --- CLIENT EVENTS ---
+# Birth dates and bond maturities feed the event index in events.py.
+
+RETIREMENT_AGE = 65
+MATURITY_EPOCH = np.datetime64("2026-01-01")
+DEMO_BIRTH_DATES = {
+    "c101": "1966-01-10", "c102": "1974-06-03", "c103": "1961-02-01", "c104": "1949-11-02", "c105": "1980-10-31",
+}
+DEMO_MATURITIES = [("c102", "2026-01-12", 1000000)]
+
+MATURITY_HOLDER_SHARE = 0.35  # clients holding bonds; each holds 1-3 maturities
+MATURITY_AMOUNTS = (50000, 2000000)  # bond sizes, log-uniform between these
+
+def get_client_event_data(book_size=BOOK_SIZE):
+    """Birth dates (book order) and bond maturities (book row, date, amount) as column arrays."""
+    return client_event_data(get_mock_book(book_size)["client_id"])
+
+def client_event_data(client_ids):
+    """``get_client_event_data`` for any client ids: drawn from per-client streams, so keyed by id."""
+    # Columns: birth date, holder, bond count, then a maturity date and an amount per bond slot
+    u = client_uniforms(client_ids, "events", 9)
+    birth = np.datetime64("1941-01-01") + (u[:, 0] * 55 * 365).astype("m8[D]")
+    # Up to three bonds per holder: slot j is held when the holder's bond count exceeds j
+    held = (u[:, 1] < MATURITY_HOLDER_SHARE)[:, None] & (np.arange(3) < 1 + (u[:, 2] * 3).astype(int)[:, None])
+    client, slot = np.nonzero(held)
+    maturity = MATURITY_EPOCH + (u[client, 3 + slot] * 5 * 365).astype("m8[D]")
+    amount = np.round(MATURITY_AMOUNTS[0] * (MATURITY_AMOUNTS[1] / MATURITY_AMOUNTS[0]) ** u[client, 6 + slot], -4)
+    row_of = {cid: row for row, cid in enumerate(client_ids)}
+    for cid, day in DEMO_BIRTH_DATES.items():
+        if cid in row_of:
+            birth[row_of[cid]] = np.datetime64(day)
+    for cid, day, value in DEMO_MATURITIES:
+        if cid in row_of:
+            client = np.r_[client, row_of[cid]]
+            maturity = np.r_[maturity, np.datetime64(day)]
+            amount = np.r_[amount, value]
+    return {
+        "birth_date": birth,
+        "maturity_client": client.astype(np.int32),
+        "maturity_date": maturity,
+        "maturity_amount": amount,
+    }
+
+@cached("client_events")
+def _events_page(day, n, book_size):
+    from events import get_event_index
+    index = get_event_index(book_size)
+    return index.frame(index.upcoming(day, n))
 
+def get_client_events(n=10, book_size=BOOK_SIZE):
+    """The next ``n`` client life/portfolio events from today (events.py), cached per day."""
+    from events import today  # events imports this module
+    return _events_page(str(today()), n, book_size)
+
+@cached("maturity_flags")
+def get_maturity_flags(day, book_size=BOOK_SIZE, days=30):
+    """Boolean mask over the book: a bond matures within ``days`` of ``day``."""
+    from events import get_event_index
+    flags = np.zeros(len(get_mock_book(book_size)["client_id"]), dtype=bool)
+    start = np.datetime64(day, "D")
+    flags[get_event_index(book_size).clients_with("MATURITY", start, start + days)] = True
+    return flags
+
+# --- TYPED MARKET TABLES ---
+# Amounts ($M) and moves (%) are float32, labels are categoricals; display
+# formatting lives in column_formats.py and is applied at render time.
+
+def _market_frame(columns, floats=(), categories=()):
+    df = pd.DataFrame(columns)
+    for col in floats:
+        df[col] = df[col].astype(np.float32)
+    for col in categories:
+        df[col] = df[col].astype("category")
+    return df
+
+@cached("market_movers")
 def get_market_movers():
-    """Generates 'Why is it moving' market explanations."""
-    return [
-        {"Ticker": "NVDA", "Move": "+4.2%", "Reason": "AI Chip demand forecast raised by analyst consensus."},
-        {"Ticker": "TSLA", "Move": "-3.1%", "Reason": "production figures missed quarterly estimates slightly."},
-        {"Ticker": "US 10Y", "Move": "+5bps", "Reason": "Stronger than expected CPI print dampening rate cut hopes."}
-    ]
+    """Generates 'Why is it moving' market explanations.
+
+    ``Move`` is the day's move in percent; for yields it is the change in
+    percentage points (+5bps -> 0.05).
+    """
+    return _market_frame({
+        "Ticker": ["NVDA", "TSLA", "US 10Y"],
+        "Move": [4.2, -3.1, 0.05],
+        "Reason": [
+            "AI Chip demand forecast raised by analyst consensus.",
+            "production figures missed quarterly estimates slightly.",
+            "Stronger than expected CPI print dampening rate cut hopes.",
+        ],
+    }, floats=["Move"], categories=["Ticker", "Reason"])
 
 # --- NEW DATA FOR INVESTMENT INFO MENU ---
 
+@cached("stock_briefing")
+@snapshotted("stock_briefing")
 def get_overseas_stock_briefing():
-    """3.1 Daily Excess Return Overseas Stock Briefing"""
-    return pd.DataFrame([
-        {"Ticker": "NVDA", "Name": "NVIDIA", "Buy(Pre/Wk)": "120M / 500M", "Sell(Pre/Wk)": "80M / 400M", "NetBuy": 40, "Chg%": "+3.2%", "Reason": "Earnings Surprise"},
-        {"Ticker": "TSLA", "Name": "Tesla", "Buy(Pre/Wk)": "90M / 350M", "Sell(Pre/Wk)": "110M / 450M", "NetBuy": -20, "Chg%": "-1.5%", "Reason": "Production Miss"},
-        {"Ticker": "AAPL", "Name": "Apple", "Buy(Pre/Wk)": "200M / 800M", "Sell(Pre/Wk)": "50M / 200M", "NetBuy": 150, "Chg%": "+0.5%", "Reason": "Safe Haven Flow"},
-        {"Ticker": "AMZN", "Name": "Amazon", "Buy(Pre/Wk)": "150M / 600M", "Sell(Pre/Wk)": "140M / 550M", "NetBuy": 10, "Chg%": "+1.1%", "Reason": "Cloud Growth"},
-        {"Ticker": "MSFT", "Name": "Microsoft", "Buy(Pre/Wk)": "180M / 700M", "Sell(Pre/Wk)": "100M / 400M", "NetBuy": 80, "Chg%": "+0.8%", "Reason": "AI Integration"},
-    ]).sort_values("NetBuy", ascending=False)
+    """3.1 Daily Excess Return Overseas Stock Briefing (amounts in $M, Chg% in percent)"""
+    df = _market_frame({
+        "Ticker": ["NVDA", "TSLA", "AAPL", "AMZN", "MSFT"],
+        "Name": ["NVIDIA", "Tesla", "Apple", "Amazon", "Microsoft"],
+        "Buy Pre": [120, 90, 200, 150, 180],
+        "Buy Wk": [500, 350, 800, 600, 700],
+        "Sell Pre": [80, 110, 50, 140, 100],
+        "Sell Wk": [400, 450, 200, 550, 400],
+        "NetBuy": [40, -20, 150, 10, 80],
+        "Chg%": [3.2, -1.5, 0.5, 1.1, 0.8],
+        "Reason": ["Earnings Surprise", "Production Miss", "Safe Haven Flow", "Cloud Growth", "AI Integration"],
+    }, floats=["Buy Pre", "Buy Wk", "Sell Pre", "Sell Wk", "NetBuy", "Chg%"], categories=["Ticker", "Name", "Reason"])
+    return df.sort_values("NetBuy", ascending=False, ignore_index=True)
 
+@cached("market_one_liners")
 def get_market_one_liners():
-    """3.2 Market One-Liner + Related Clients"""
+    """3.2 Market One-Liners (Move in percent); related clients come from holdings_index"""
     return [
-        {"Symbol": "TSLA", "Reason": "Price cut announced in China region", "Clients": ["Arthur Pendragon", "Merlin Ambrosius"]},
-        {"Symbol": "XOM", "Reason": "Oil prices surge due to geopolitical tension", "Clients": ["Guinevere Leodegrance"]},
-        {"Symbol": "AAPL", "Reason": "Vision Pro sales exceeding expectations", "Clients": []},
+        {"Symbol": "TSLA", "Move": -1.5, "Reason": "Price cut announced in China region"},
+        {"Symbol": "XOM", "Move": 2.4, "Reason": "Oil prices surge due to geopolitical tension"},
+        {"Symbol": "AAPL", "Move": 0.5, "Reason": "Vision Pro sales exceeding expectations"},
     ]
 
+@cached("market_briefing_tabs")
 def get_market_briefing_tabs():
     """3.3 Market Briefing Tabs"""
     return {
@@ -184,6 +490,8 @@ def get_market_briefing_tabs():
         "Insight": "⚠️ **Risk Alert**: Yen carry trade unwinding could cause short-term volatility. Reduce leverage recommended."
     }
 
+@cached("house_asset_allocation")
+@snapshotted("house_asset_allocation")
 def get_house_asset_allocation():
     """3.4 House View Allocation History"""
     return pd.DataFrame({
@@ -194,14 +502,84 @@ def get_house_asset_allocation():
         "Change": ["-5% (Bearish)", "+5% (Bullish)", "-", "-"]
     })
 
-def get_product_recommendations():
-    """3.5 Product & Client Matching"""
-    return pd.DataFrame([
-        {"Product": "Global Tech ETF", "Type": "ETF", "Rec Clients": 12, "Reason": "Growth Potential"},
-        {"Product": "US Treasury 5Y", "Type": "Bond", "Rec Clients": 8, "Reason": "Yield Stability"},
-        {"Product": "Green Energy Fund", "Type": "Fund", "Rec Clients": 5, "Reason": "ESG Mandate"},
+# --- PRODUCT MATCHING ---
+# Products are scored against every client by matching.py; named products come first.
+
+PRODUCT_UNIVERSE_SIZE = 500
+NAMED_PRODUCTS = [
+    # Product, Type, asset class, risk level (RISK_PROFILES index), mandate flags, Reason
+    ("Global Tech ETF", "ETF", "Equities", 3, (), "Growth Potential"),
+    ("US Treasury 5Y", "Bond", "Fixed Income", 0, ("INCOME",), "Yield Stability"),
+    ("Green Energy Fund", "Fund", "Alternatives", 2, ("ESG",), "ESG Mandate"),
+]
+PRODUCT_TYPES = {
+    "Equities": ("ETF", "Growth Potential"),
+    "Fixed Income": ("Bond", "Yield Stability"),
+    "Alternatives": ("Fund", "Diversification"),
+    "Cash": ("MMF", "Liquidity Parking"),
+}
+
+def get_client_mandates(client_ids):
+    """``(preferred, excluded)`` mandate bitmasks per client (see matching.MANDATE_FLAGS)."""
+    u = client_normals(client_ids, "mandates", 4)
+    bits = MANDATE_BITS
+    preferred = np.where(u[:, 0] > 1.0, bits["ESG"], 0) | np.where(u[:, 1] > 0.85, bits["INCOME"], 0)
+    excluded = np.where(u[:, 2] > 1.3, bits["EM"], 0) | np.where(u[:, 3] > 0.5, bits["LEVERAGE"], 0)
+    return preferred.astype(np.uint8), excluded.astype(np.uint8)
+
+@cached("product_universe")
+def get_product_universe(size=PRODUCT_UNIVERSE_SIZE):
+    """Product shelf as column arrays: name, type, reason, asset_class (code), risk, flags."""
+    rng = np.random.default_rng(BOOK_SEED + 2)
+    n_synth = max(size - len(NAMED_PRODUCTS), 0)
+    asset_class = rng.integers(0, len(ASSET_CLASSES), n_synth)
+    flag_bits = np.array(list(MANDATE_BITS.values()))
+    flags = np.bitwise_or.reduce(np.where(rng.random((n_synth, len(flag_bits))) < 0.12, flag_bits, 0), axis=1)
+    names, types, reasons, classes, risks, product_flags = zip(*[
+        (name, ptype, reason, ASSET_CLASSES.index(ac), risk, sum(int(MANDATE_BITS[f]) for f in fl))
+        for name, ptype, ac, risk, fl, reason in NAMED_PRODUCTS
     ])
+    return {
+        "name": np.array(list(names) + [f"{ASSET_CLASSES[a]} Product {i:03d}" for i, a in enumerate(asset_class, 1)], dtype=object),
+        "type": np.array(list(types) + [PRODUCT_TYPES[ASSET_CLASSES[a]][0] for a in asset_class], dtype=object),
+        "reason": np.array(list(reasons) + [PRODUCT_TYPES[ASSET_CLASSES[a]][1] for a in asset_class], dtype=object),
+        "asset_class": np.r_[classes, asset_class].astype(np.int8),
+        "risk": np.r_[risks, rng.integers(0, len(RISK_PROFILES), n_synth)].astype(np.int8),
+        "flags": np.r_[product_flags, flags].astype(np.uint8),
+    }
+
+@cached("product_matches")
+def get_product_matches(k=5, book_size=BOOK_SIZE, universe_size=PRODUCT_UNIVERSE_SIZE):
+    """Book x product suitability: ``(counts, top_idx, top_score)`` from matching.match_products."""
+    book = get_mock_book(book_size)
+    products = get_product_universe(universe_size)
+    weights, _ = get_book_portfolios(book_size)
+    preferred, excluded = get_client_mandates(book["client_id"])
+    return match_products(
+        client_codes(book["risk_profile"], preferred, excluded),
+        allocation_gaps(book["risk_profile"], weights),
+        product_codes(products["risk"], products["flags"]),
+        products["asset_class"], k=k,
+    )
 
+@cached("product_recommendations")
+@snapshotted("product_recommendations")
+def get_product_recommendations(k=5, limit=20, book_size=BOOK_SIZE):
+    """3.5 Product & Client Matching: the ``limit`` products with most matched clients, with their top ``k``"""
+    products = get_product_universe()
+    counts, top_idx, _ = get_product_matches(k, book_size)
+    names = get_mock_book(book_size)["client_name"]
+    df = pd.DataFrame({
+        "Product": products["name"],
+        "Type": products["type"],
+        "Rec Clients": counts,
+        "Top Clients": [names[row[row >= 0]].tolist() for row in top_idx],
+        "Reason": products["reason"],
+    })
+    return df.sort_values("Rec Clients", ascending=False, kind="stable", ignore_index=True).head(limit)
+
+@cached("seeking_alpha")
+@snapshotted("seeking_alpha")
 def get_seeking_alpha_list():
     """3.6 Seeking Alpha (Internal Sources)"""
     return pd.DataFrame([
@@ -210,14 +588,18 @@ def get_seeking_alpha_list():
         {"Type": "Supply/Demand", "Asset": "Copper", "Idea": "Supply shortage due to strike in Chile", "Valid Until": "2026-01-20"},
     ])
 
+@cached("trade_review")
+@snapshotted("trade_review")
 def get_trade_review():
-    """3.7 Buy/Sell Review & Outlook"""
-    return pd.DataFrame([
-        {"Ticker": "NVDA", "Action": "Buy", "Post-Move": "+2.1%", "Outlook": "Positive (Momentum)"},
-        {"Ticker": "TSLA", "Action": "Sell", "Post-Move": "-1.5%", "Outlook": "Neutral (Wait)"},
-        {"Ticker": "LQD", "Action": "Buy", "Post-Move": "+0.3%", "Outlook": "Positive (Income)"},
-    ])
+    """3.7 Buy/Sell Review & Outlook (Post-Move in percent)"""
+    return _market_frame({
+        "Ticker": ["NVDA", "TSLA", "LQD"],
+        "Action": ["Buy", "Sell", "Buy"],
+        "Post-Move": [2.1, -1.5, 0.3],
+        "Outlook": ["Positive (Momentum)", "Neutral (Wait)", "Positive (Income)"],
+    }, floats=["Post-Move"], categories=["Ticker", "Action", "Outlook"])
 
+@cached("insights")
 def get_mock_insights(client_id):
     return [
         "**Portfolio Drift**: Equity allocation is **5% Overweight** vs Target due to recent Tech rally.",
@@ -0,0 +1,73 @@
+"""Concurrent prefetch of widget data before a dashboard grid is rendered.
+
+Page code hands over the data sources of its active widgets; they are loaded
+in parallel on a process-wide thread pool, each with its own timeout. A source
+that misses its deadline keeps running in the background (its result lands in
+the provider cache) and the widget shows a placeholder instead of blocking the
+grid. The placeholder polls ``done`` and reruns the page once the load has
+finished; a rerun reuses a still-running load rather than starting another.
+"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+DEFAULT_TIMEOUT = 2.0  # seconds
+MAX_WORKERS = 8
+POLL_SECONDS = 0.5  # how often a placeholder checks on a source that missed its deadline
+
+# status: ok | timeout | error; seconds: how long the caller waited for this source
+PrefetchResult = namedtuple("PrefetchResult", ["status", "value", "error", "seconds"])
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="prefetch")
+_inflight = {}
+_lock = threading.Lock()
+
+
+def _key(loader):
+    return getattr(loader, "provider", loader)
+
+
+def _submit(loader):
+    key = _key(loader)
+    with _lock:
+        future = _inflight.get(key)
+        if future is None or future.done():
+            future = _inflight[key] = _executor.submit(loader)
+        return future
+
+
+def prefetch(sources, timeouts=None, default_timeout=DEFAULT_TIMEOUT):
+    """Loads ``{name: loader}`` concurrently and returns ``{name: PrefetchResult}``.
+
+    ``timeouts`` maps names to per-source timeouts in seconds; all deadlines are
+    measured from the start of the call, so the total wait is bounded by the
+    largest timeout rather than the sum.
+    """
+    timeouts = timeouts or {}
+    start = time.monotonic()
+    futures = {name: _submit(loader) for name, loader in sources.items()}
+    results = {}
+    for name, future in futures.items():
+        remaining = start + timeouts.get(name, default_timeout) - time.monotonic()
+        try:
+            value = future.result(timeout=max(remaining, 0))
+            results[name] = PrefetchResult("ok", value, None, time.monotonic() - start)
+        except FutureTimeout:
+            results[name] = PrefetchResult("timeout", None, None, time.monotonic() - start)
+        except Exception as exc:
+            results[name] = PrefetchResult("error", None, exc, time.monotonic() - start)
+    return results
+
+
+def warm(loaders):
+    """Starts loaders in the background without waiting; their results land in the caches."""
+    for loader in loaders:
+        _submit(loader)
+
+
+def done(loader):
+    """True once no load of ``loader`` is running, i.e. a rerun will find its result ready."""
+    with _lock:
+        future = _inflight.get(_key(loader))
+    return future is None or future.done()
@@ -0,0 +1,217 @@
+"""Rerun-latency benchmarks for every dashboard page and the presentation deck.
+
+    python ui/rerun_bench.py                      # run, compare with ui/bench_baseline.json
+    python ui/rerun_bench.py --update             # run and re-record the baseline
+    python ui/rerun_bench.py --sizes 5 1000       # pick synthetic book sizes
+
+Scenarios drive the apps headlessly through Streamlit's ``AppTest`` with
+scripted interactions (page changes, client and group selection, widget
+layout toggles, slide navigation). Every step records:
+
+* ``wall_s``   wall time of the rerun
+* ``peak_mb``  peak Python heap during the rerun (tracemalloc, measured in a
+               second pass so it does not distort the timings)
+* ``payload_kb`` serialized size of the elements the rerun sends to the browser
+
+Each book size runs in a fresh interpreter because ``PB_BOOK_SIZE`` is read at
+import time. The run fails (exit code 1) when any step regresses past the
+tolerances below relative to the stored baseline.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+UI_DIR = Path(__file__).parent
+REPO_DIR = UI_DIR.parent
+BASELINE_PATH = UI_DIR / "bench_baseline.json"
+
+DEFAULT_SIZES = [5, 1000, 50000]
+
+# A step regresses when it exceeds baseline * (1 + tolerance) + slack
+WALL_TOLERANCE, WALL_SLACK_S = 0.5, 0.05
+PEAK_TOLERANCE, PEAK_SLACK_MB = 0.25, 1.0
+PAYLOAD_TOLERANCE, PAYLOAD_SLACK_KB = 0.10, 1.0
+
+
+# --- SCENARIOS ---
+
+def _page(name):
+    return lambda at: at.sidebar.radio[0].set_value(name)
+
+
+def _select_index(label, index):
+    return lambda at: next(s for s in at.selectbox if s.label == label).select_index(index)
+
+
+def _layout(keep):
+    return lambda at: at.multiselect[0].set_value(at.multiselect[0].options[:keep])
+
+
+def _next_page(at):
+    page_no = at.number_input(key="prio_page")
+    return page_no.set_value(min(2, page_no.max))
+
+
+def _resource_button(at):
+    return at.button(key="btn_res_0").click()
+
+
+def _next_slide(at):
+    return next(b for b in at.button if b.label == "Next ➡️").click()
+
+
+DASHBOARD = "streamlit_app.py"
+DECK = "presentation_app.py"
+
+# (scenario, script, [(step, action or None for the initial run)])
+SCENARIOS = [
+    ("investment_info", DASHBOARD, [
+        ("load", None),
+        ("layout: 3 widgets", _layout(3)),
+        ("layout: all widgets", _layout(None)),
+    ]),
+    ("client_management", DASHBOARD, [
+        ("load", None),
+        ("open page", _page("👥 Client Management")),
+        ("group: High Net Worth", _select_index("Filter View by Group", 1)),
+        ("group: All Clients", _select_index("Filter View by Group", 0)),
+        ("sort by AUM", lambda at: at.selectbox(key="prio_sort").set_value("aum_usd")),
+        ("next page", _next_page),
+    ]),
+    ("client_detail", DASHBOARD, [
+        ("load", None),
+        ("open page", _page("👤 Client Detail")),
+        ("client #2", _select_index("Select Client", 1)),
+        ("client #3", _select_index("Select Client", 2)),
+    ]),
+    ("proposal", DASHBOARD, [
+        ("load", None),
+        ("open page", _page("✉️ Proposal & Messaging")),
+        ("client #2", _select_index("Select Target Client", 1)),
+        ("group: ELS Buyers", _select_index("Filter View by Group", 2)),
+    ]),
+    ("deck", DECK, [("load", None)] + [(f"next -> slide {i}", _next_slide) for i in range(2, 9)] + [
+        ("full deck", lambda at: at.sidebar.toggle[0].set_value(False)),
+        ("resource button", _resource_button),
+    ]),
+]
+
+
+# --- MEASUREMENT (runs inside the per-size child process) ---
+
+def payload_bytes(at):
+    """Serialized size of every element proto in the current render tree."""
+    total = 0
+    for node in at._tree:
+        proto = getattr(node, "proto", None)
+        if proto is not None and hasattr(proto, "ByteSize") and not hasattr(node, "children"):
+            total += proto.ByteSize()
+    return total
+
+
+def _run_scenario(script, steps, trace_memory):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(UI_DIR / script), default_timeout=300)
+    results = []
+    for step, action in steps:
+        pending = at if action is None else action(at)
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        pending.run()
+        wall = time.perf_counter() - start
+        peak = 0
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if at.exception:
+            raise RuntimeError(f"{script} / {step}: {at.exception[0].value}")
+        results.append({"wall_s": wall, "peak_mb": peak / 2**20, "payload_kb": payload_bytes(at) / 1024})
+    return results
+
+
+def run_all():
+    """All scenarios for the current PB_BOOK_SIZE: ``{scenario: {step: metrics}}``."""
+    report = {}
+    for name, script, steps in SCENARIOS:
+        timed = _run_scenario(script, steps, trace_memory=False)
+        traced = _run_scenario(script, steps, trace_memory=True)
+        report[name] = {
+            step: {"wall_s": t["wall_s"], "peak_mb": m["peak_mb"], "payload_kb": t["payload_kb"]}
+            for (step, _), t, m in zip(steps, timed, traced)
+        }
+    return report
+
+
+# --- DRIVER ---
+
+def run_size(size):
+    env = dict(os.environ, PB_BOOK_SIZE=str(size))
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child"], cwd=REPO_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"book size {size} failed:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def regressions(current, baseline):
+    found = []
+    checks = [
+        ("wall_s", WALL_TOLERANCE, WALL_SLACK_S),
+        ("peak_mb", PEAK_TOLERANCE, PEAK_SLACK_MB),
+        ("payload_kb", PAYLOAD_TOLERANCE, PAYLOAD_SLACK_KB),
+    ]
+    for size, scenarios in current.items():
+        for scenario, steps in scenarios.items():
+            for step, metrics in steps.items():
+                base = baseline.get(size, {}).get(scenario, {}).get(step)
+                if base is None:
+                    continue
+                for metric, tolerance, slack in checks:
+                    limit = base[metric] * (1 + tolerance) + slack
+                    if metrics[metric] > limit:
+                        found.append(f"[{size}] {scenario} / {step}: {metric} {metrics[metric]:.3f} > {limit:.3f}")
+    return found
+
+
+def print_report(current):
+    print(f"{'size':>7}  {'scenario':<18}{'step':<24}{'wall s':>8}{'peak MB':>9}{'payload KB':>12}")
+    for size, scenarios in current.items():
+        for scenario, steps in scenarios.items():
+            for step, m in steps.items():
+                print(f"{size:>7}  {scenario:<18}{step:<24}{m['wall_s']:>8.3f}{m['peak_mb']:>9.1f}{m['payload_kb']:>12.1f}")
+
+
+def main(argv):
+    if "--child" in argv:
+        print(json.dumps(run_all()))
+        return 0
+    sizes = DEFAULT_SIZES
+    if "--sizes" in argv:
+        sizes = [int(a) for a in argv[argv.index("--sizes") + 1:] if a.isdigit()]
+    current = {str(size): run_size(size) for size in sizes}
+    print_report(current)
+
+    if "--update" in argv:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        baseline.update(current)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=1, sort_keys=True) + "\n")
+        print(f"baseline written to {BASELINE_PATH}")
+        return 0
+    if not BASELINE_PATH.exists():
+        print("no baseline yet; run with --update to record one")
+        return 0
+    found = regressions(current, json.loads(BASELINE_PATH.read_text()))
+    for line in found:
+        print("REGRESSION", line)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""Book-wide factor-drift engine.
+
+Takes a ``(N, len(FACTORS))`` matrix of current factor exposures and computes
+drift against the house target, drift norms and a book-wide drift ranking,
+all vectorized over the whole book.
+"""
+import numpy as np
+
+from scoring import top_k
+
+FACTORS = ["Growth", "Value", "Momentum", "Volatility", "Liquidity", "Size"]
+TARGET_EXPOSURE = np.array([0.5, 0.5, 0.5, 0.0, 0.8, 0.2], dtype=np.float32)
+
+# Clients above this drift-norm quantile get the RISK_DRIFT reason tag.
+DRIFT_FLAG_QUANTILE = 0.9
+
+
+def drift_matrix(current, target=TARGET_EXPOSURE):
+    return (current - target).astype(np.float32, copy=False)
+
+
+def drift_norms(drift):
+    """L2 norm of each client's drift vector."""
+    return np.sqrt(np.einsum("ij,ij->i", drift, drift, dtype=np.float32))
+
+
+def drift_ranks(norms):
+    """1-based rank of every client by drift norm (1 = largest drift)."""
+    order = top_k(norms, None)
+    ranks = np.empty(len(norms), dtype=np.int64)
+    ranks[order] = np.arange(1, len(norms) + 1)
+    return ranks
+
+
+def drift_flags(norms, quantile=DRIFT_FLAG_QUANTILE):
+    if len(norms) == 0:
+        return np.zeros(0, dtype=bool)
+    return norms >= np.quantile(norms, quantile)
+
+
+def compute_book_risk(current):
+    """Exposure, drift, drift norm and drift rank arrays for the whole book."""
+    drift = drift_matrix(current)
+    norms = drift_norms(drift)
+    return {
+        "current": current,
+        "drift": drift,
+        "drift_norm": norms,
+        "drift_rank": drift_ranks(norms),
+    }
@@ -0,0 +1,132 @@
+"""Columnar priority-scoring engine for the PB Command Center.
+
+Works on the column arrays returned by ``mock_data.get_mock_book``: scores and
+reason tags are computed for the whole book with NumPy, reason tags are kept as
+bitmasks, and only the top-K rows are ever turned into a DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+# --- REASON TAGS (one bit each) ---
+
+REASONS = [
+    {"code": "RISK_DRIFT", "label": "Risk Drift > 5%", "severity": "high"},
+    {"code": "LIQUIDITY", "label": "Cash Drag (15%)", "severity": "medium"},
+    {"code": "MATURITY", "label": "Bond Maturity (30d)", "severity": "medium"},
+    {"code": "NEWS", "label": "Tech Sector Volatility", "severity": "low"},
+]
+REASON_BITS = {r["code"]: np.uint8(1 << i) for i, r in enumerate(REASONS)}
+
+CALL_THRESHOLD = 80
+REVIEW_THRESHOLD = 60
+
+
+def reason_masks(scores):
+    """Reason bitmask per client derived from the score bands."""
+    masks = np.zeros(len(scores), dtype=np.uint8)
+    masks[scores > CALL_THRESHOLD] |= REASON_BITS["RISK_DRIFT"]
+    review = (scores > REVIEW_THRESHOLD) & (scores <= CALL_THRESHOLD)
+    masks[review] |= REASON_BITS["LIQUIDITY"]
+    return masks
+
+
+def decode_reasons(mask):
+    """Reason labels for a single bitmask value."""
+    mask = int(mask)
+    return [r["label"] for i, r in enumerate(REASONS) if mask & (1 << i)]
+
+
+def score_book(book, drift_flags=None, maturity_flags=None):
+    """Returns ``(scores, reason_masks)`` for every client in the book.
+
+    ``drift_flags`` (from the risk engine) adds RISK_DRIFT to clients whose
+    factor drift ranks among the largest in the book; ``maturity_flags``
+    (from the event index) adds MATURITY to clients with a bond maturing soon.
+    """
+    scores = np.asarray(book["priority_score"])
+    masks = reason_masks(scores)
+    if drift_flags is not None:
+        masks[drift_flags] |= REASON_BITS["RISK_DRIFT"]
+    if maturity_flags is not None:
+        masks[maturity_flags] |= REASON_BITS["MATURITY"]
+    return scores, masks
+
+
+def _ordered(keys, k, candidates):
+    """The ``k`` candidates with the smallest keys, in key order (ties by book order).
+
+    ``candidates`` are book positions in ascending order. Ties at the cutoff
+    key are filled in book order too, so the result is always a prefix of
+    one stable sort and pages never overlap.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(candidates):
+        values = keys[candidates]
+        kth = values[np.argpartition(values, k - 1)[k - 1]]
+        below = candidates[values < kth]
+        tied = candidates[values == kth]
+        candidates = np.concatenate([below, tied[:k - len(below)]])
+    return candidates[np.lexsort((candidates, keys[candidates]))]
+
+
+def top_k(scores, k):
+    """Indices of the ``k`` highest scores, best first (ties by book order)."""
+    n = len(scores)
+    return _ordered(-scores.astype(np.float64), n if k is None else min(k, n), np.arange(n))
+
+
+# --- SERVER-SIDE PAGING ---
+
+SORT_COLUMNS = {"priority_score": "Priority Score", "aum_usd": "AUM"}
+
+
+def _in_range(values, bounds):
+    """Mask of ``lo <= values <= hi``; either bound may be None (open)."""
+    lo, hi = bounds
+    keep = np.ones(len(values), dtype=bool)
+    if lo is not None:
+        keep &= values >= lo
+    if hi is not None:
+        keep &= values <= hi
+    return keep
+
+
+def query_priority(book, scores, masks, sort_by="priority_score", descending=True,
+                   reason=None, score_range=None, aum_range=None, include=None, offset=0, limit=25):
+    """Filters, sorts and slices the book; returns ``(row indices, total matches)``.
+
+    ``reason`` is a reason code, ``score_range`` / ``aum_range`` inclusive
+    ``(lo, hi)`` bounds (None = open) and ``include`` an optional boolean mask
+    over the book. Only ``offset + limit`` rows are ever ordered.
+    """
+    keep = np.ones(len(scores), dtype=bool) if include is None else np.asarray(include, dtype=bool).copy()
+    if reason is not None:
+        keep &= (masks & REASON_BITS[reason]) != 0
+    if score_range is not None:
+        keep &= _in_range(scores, score_range)
+    if aum_range is not None:
+        keep &= _in_range(np.asarray(book["aum_usd"]), aum_range)
+    candidates = np.flatnonzero(keep)
+    total = len(candidates)
+
+    values = scores if sort_by == "priority_score" else np.asarray(book[sort_by])
+    keys = values.astype(np.float64)
+    if descending:
+        keys = -keys
+    idx = _ordered(keys, min(offset + limit, total), candidates)
+    return idx[offset:], total
+
+
+def priority_frame(book, idx, scores, masks):
+    """Materializes the selected rows in the priority-list DataFrame layout."""
+    sel_scores = scores[idx]
+    return pd.DataFrame({
+        "client_id": book["client_id"][idx],
+        "client_name": book["client_name"][idx],
+        "priority_score": sel_scores,
+        "aum_usd": book["aum_usd"][idx],
+        "reason_tags": [decode_reasons(m) for m in masks[idx]],
+        "last_contact": [f"{d} days ago" for d in book["last_contact_days"][idx]],
+        "next_action": np.where(sel_scores > CALL_THRESHOLD, "Call", "Email"),
+    })
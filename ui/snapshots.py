@@ -0,0 +1,172 @@
+"""Memory-mapped Arrow IPC snapshots of the mock_data tables.
+
+    python ui/snapshots.py write [--size N]   # (re)write every snapshot atomically
+    python ui/snapshots.py list               # show what is on disk
+
+Providers decorated with ``@snapshotted`` read their table from
+``SNAPSHOT_DIR/<name>[-<args>].arrow`` when that file exists instead of
+building it. Files are uncompressed Arrow IPC, opened with ``pa.memory_map``.
+Numeric columns come back as zero-copy, read-only numpy views, string columns
+of frames as Arrow-backed pandas columns and dictionary columns as
+categoricals. Every session and worker process reading a snapshot therefore
+shares the same OS page-cache pages rather than holding a private copy.
+
+The writer builds each table from the undecorated provider, writes it to a
+temporary file in the same directory and ``os.replace``s it into place.
+Readers never see a half-written file. Already-open maps keep the old
+version until their cache entry expires.
+"""
+import inspect
+import os
+import sys
+from functools import wraps
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - pyarrow ships with Streamlit
+    pa = None
+
+SNAPSHOT_DIR = Path(os.environ.get("PB_SNAPSHOT_DIR") or Path(__file__).parent / "data" / "snapshots")
+SUFFIX = ".arrow"
+
+# Providers registered by @snapshotted, by snapshot name
+REGISTRY = {}
+
+
+def snapshot_path(name, args=(), directory=None):
+    """File for a provider call; arguments that are not None become part of the name."""
+    parts = [name] + [str(a) for a in args if a is not None]
+    return Path(directory or SNAPSHOT_DIR) / ("-".join(parts) + SUFFIX)
+
+
+# --- CONVERSION ---
+
+def _columns_table(columns):
+    return pa.table({k: pa.array(v.tolist() if v.dtype == object else v) for k, v in columns.items()})
+
+
+def _table_columns(table):
+    """dict of numpy arrays; fixed-width columns are zero-copy views into the map."""
+    out = {}
+    for name in table.column_names:
+        chunk = table.column(name).combine_chunks()
+        if pa.types.is_string(chunk.type) or pa.types.is_large_string(chunk.type):
+            out[name] = chunk.to_numpy(zero_copy_only=False).astype(object)
+        else:
+            out[name] = chunk.to_numpy(zero_copy_only=True)
+    return out
+
+
+def _arrow_strings(arrow_type):
+    # Strings stay Arrow-backed (zero-copy); dictionaries become categoricals and numbers numpy.
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+CONVERTERS = {
+    # kind: (value -> pa.Table, pa.Table -> value)
+    "columns": (_columns_table, _table_columns),
+    "frame": (
+        lambda df: pa.Table.from_pandas(df, preserve_index=False),
+        lambda table: table.to_pandas(types_mapper=_arrow_strings),
+    ),
+}
+
+
+# --- READ / WRITE ---
+
+def read_table(path):
+    """Opens a snapshot memory-mapped; None when it does not exist."""
+    if pa is None or not path.exists():
+        return None
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def write_table(path, table):
+    """Atomically writes ``table`` to ``path`` (temp file in the same directory, then rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table.combine_chunks())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def snapshotted(name, kind="frame"):
+    """Serves a provider from its snapshot file when present, else builds it.
+
+    ``kind`` is "frame" for DataFrames or "columns" for dicts of 1-D arrays.
+    Goes under ``@cached`` so the mapped table is opened once per cache lifetime.
+    """
+    to_table, from_table = CONVERTERS[kind]
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def path_for(args, kwargs, directory=None):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return snapshot_path(name, bound.arguments.values(), directory)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            table = read_table(path_for(args, kwargs))
+            return func(*args, **kwargs) if table is None else from_table(table)
+
+        def snapshot(*args, directory=None, **kwargs):
+            """Builds the table and writes its snapshot; returns the path."""
+            return write_table(path_for(args, kwargs, directory), to_table(func(*args, **kwargs)))
+
+        wrapper.build = func
+        wrapper.snapshot = snapshot
+        REGISTRY[name] = wrapper
+        return wrapper
+    return decorator
+
+
+# --- CLI ---
+
+BOOK_SIZE_PARAMS = ("size", "book_size")  # provider parameters that take the book size
+
+def write_all(book_size=None, directory=None):
+    """Rebuilds every registered snapshot; the book-sized ones for ``book_size``.
+
+    Every provider with a ``size`` or ``book_size`` parameter gets ``book_size``
+    (when given), so the files match what the pages request for that book.
+    """
+    import mock_data  # noqa: F401  (importing registers the providers)
+    from snapshots import REGISTRY as registry  # the imported module's, also under __main__
+
+    written = []
+    for provider in registry.values():
+        params = inspect.signature(provider.build).parameters
+        kwargs = {} if book_size is None else {p: book_size for p in BOOK_SIZE_PARAMS if p in params}
+        written.append(provider.snapshot(directory=directory, **kwargs))
+    return written
+
+
+def main(argv):
+    if argv[:1] == ["write"]:
+        size = int(argv[argv.index("--size") + 1]) if "--size" in argv else None
+        for path in write_all(size):
+            print(f"{path.stat().st_size / 1024:>10.1f} KB  {path}")
+        return 0
+    if argv[:1] == ["list"]:
+        for path in sorted(SNAPSHOT_DIR.glob(f"*{SUFFIX}")):
+            print(f"{path.stat().st_size / 1024:>10.1f} KB  {path.name}")
+        return 0
+    print(__doc__.split("\n\n")[1])
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
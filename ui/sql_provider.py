@@ -0,0 +1,378 @@
+"""SQLAlchemy-backed data provider over the BLUEPRINT tables.
+
+    python ui/sql_provider.py seed [--size N]     # (re)load the tables from mock_data
+    python ui/sql_provider.py bench [--page N]    # time the provider queries
+
+A local SQLite file (``ui/data/pb.db``) stands in for PostgreSQL until
+``PB_DATABASE_URL`` points somewhere else. Query shape follows what the pages
+need:
+
+* one pooled engine per process; every SQLite connection runs in WAL mode and
+  keeps its own prepared-statement cache. All statements are module-level Core
+  constructs, so SQLAlchemy compiles each one once and the driver reuses the
+  prepared statement.
+* per-page loads are set-based: the page's client ids are staged in a
+  per-connection temp table and joined in a single query, instead of one query
+  per client. The SQL text does not depend on the number of ids, so the
+  prepared statement is reused across pages of any size.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, SmallInteger, String, Table, Text,
+    bindparam, create_engine, delete, event, func, insert, select,
+)
+from sqlalchemy.exc import IntegrityError
+
+import mock_data
+from churn import ChurnScorer
+from client_registry import ClientRegistry
+from data_cache import cached
+from data_provider import MockDataProvider, RECOMMENDATION_STATUSES
+from events import EventIndex, today
+from risk_engine import compute_book_risk, drift_flags
+from scoring import score_book
+
+DATABASE_URL = os.environ.get("PB_DATABASE_URL") or f"sqlite:///{Path(__file__).parent / 'data' / 'pb.db'}"
+POOL_SIZE = 5
+MAX_OVERFLOW = 5
+STATEMENT_CACHE = 256  # prepared statements kept per SQLite connection
+
+# --- SCHEMA (see BLUEPRINT.md, "Data Model") ---
+
+metadata = MetaData()
+
+clients = Table(
+    "clients", metadata,
+    Column("id", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("risk_profile", String, nullable=False),
+    Column("rm_id", String),
+    # Book columns the priority list works from (not in the blueprint yet)
+    Column("priority_score", SmallInteger, nullable=False),
+    Column("aum_usd", Float, nullable=False),
+    Column("last_contact_days", SmallInteger, nullable=False),
+)
+portfolios = Table(
+    "portfolios", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("client_id", String, ForeignKey("clients.id"), nullable=False, unique=True),
+)
+positions = Table(
+    "positions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("portfolio_id", Integer, ForeignKey("portfolios.id"), nullable=False),
+    Column("instrument_id", String, nullable=False),
+    Column("quantity", Float, nullable=False),
+    Column("mv_local", Float, nullable=False),
+    Index("ix_positions_portfolio_id", "portfolio_id"),
+)
+recommendations = Table(
+    "recommendations", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("client_id", String, ForeignKey("clients.id"), nullable=False, index=True),
+    Column("status", String, nullable=False),  # DRAFT / APPROVED / REJECTED
+    Column("content_json", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False, server_default=func.current_timestamp()),
+)
+audit_logs = Table(
+    "audit_logs", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("entity_type", String, nullable=False),
+    Column("entity_id", String, nullable=False),
+    Column("action", String, nullable=False),
+    Column("user_id", String, nullable=False),
+    Column("timestamp", DateTime, nullable=False, server_default=func.current_timestamp()),
+    Column("details_json", Text, nullable=False),
+)
+
+# Per-connection staging table for set-based loads (created on connect, never by create_all)
+staged_ids = Table("staged_client_ids", MetaData(), Column("client_id", String, primary_key=True))
+
+# --- STATEMENTS (compiled once, prepared once per connection) ---
+
+BOOK = select(
+    clients.c.id, clients.c.name, clients.c.priority_score, clients.c.aum_usd,
+    clients.c.last_contact_days, clients.c.risk_profile,
+).order_by(clients.c.id)
+BOOK_LIMIT = BOOK.limit(bindparam("n"))
+CLEAR_STAGED = delete(staged_ids)
+STAGE_IDS = insert(staged_ids)
+# IN (subquery) rather than a join: the staging table has no statistics, and
+# SQLite would otherwise scan positions instead of probing the client_id index.
+STAGED_POSITIONS = (
+    select(portfolios.c.client_id, positions.c.instrument_id, positions.c.mv_local)
+    .join_from(portfolios, positions, positions.c.portfolio_id == portfolios.c.id)
+    .where(portfolios.c.client_id.in_(select(staged_ids.c.client_id)))
+)
+CLIENT_POSITIONS = (
+    select(positions.c.instrument_id, positions.c.mv_local)
+    .join_from(portfolios, positions, positions.c.portfolio_id == portfolios.c.id)
+    .where(portfolios.c.client_id == bindparam("client_id"))
+)
+RECOMMENDATIONS = select(recommendations).order_by(recommendations.c.id.desc())
+INSERT_RECOMMENDATION = insert(recommendations)
+INSERT_AUDIT = insert(audit_logs)
+
+
+def _on_connect(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode = WAL")
+    cur.execute("PRAGMA synchronous = NORMAL")
+    cur.execute("PRAGMA foreign_keys = ON")
+    cur.execute("CREATE TEMP TABLE IF NOT EXISTS staged_client_ids (client_id TEXT PRIMARY KEY)")
+    cur.close()
+
+
+def make_engine(url=DATABASE_URL, pool_size=POOL_SIZE):
+    """Pooled engine; SQLite files get WAL, a larger statement cache and the staging table."""
+    if url.startswith("sqlite"):
+        path = url.split("///", 1)[-1]
+        if path and path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(
+            url, pool_size=pool_size, max_overflow=MAX_OVERFLOW,
+            connect_args={"check_same_thread": False, "cached_statements": STATEMENT_CACHE},
+        )
+        event.listen(engine, "connect", _on_connect)
+    else:
+        engine = create_engine(url, pool_size=pool_size, max_overflow=MAX_OVERFLOW, pool_pre_ping=True)
+    metadata.create_all(engine)
+    return engine
+
+
+def seed(engine, book_size=None):
+    """Replaces the client, portfolio and position tables with the mock book (bulk inserts)."""
+    book = mock_data.get_mock_book.uncached(book_size)
+    ids = book["client_id"]
+    _, values = mock_data.get_mock_portfolios(ids)
+    n, k = values.shape
+    with engine.begin() as conn:
+        for table in (positions, portfolios, recommendations, clients):
+            conn.execute(delete(table))
+        conn.execute(insert(clients), [
+            {"id": cid, "name": name, "risk_profile": mock_data.RISK_PROFILES[p], "rm_id": "rm001",
+             "priority_score": int(s), "aum_usd": float(a), "last_contact_days": int(d)}
+            for cid, name, p, s, a, d in zip(ids, book["client_name"], book["risk_profile"],
+                                              book["priority_score"], book["aum_usd"], book["last_contact_days"])
+        ])
+        conn.execute(insert(portfolios), [{"id": i + 1, "client_id": cid} for i, cid in enumerate(ids)])
+        conn.execute(insert(positions), [
+            {"portfolio_id": i // k + 1, "instrument_id": mock_data.ASSET_CLASSES[i % k],
+             "quantity": float(v), "mv_local": float(v)}
+            for i, v in enumerate(values.ravel().tolist())
+        ])
+    return n
+
+
+def _weights(values):
+    totals = values.sum(axis=1, keepdims=True)
+    return np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+
+
+class SqlDataProvider(MockDataProvider):
+    """BLUEPRINT tables through a pooled SQLAlchemy engine; market data still comes from mock_data."""
+
+    name = "sql"
+
+    def __init__(self, url=DATABASE_URL, pool_size=POOL_SIZE):
+        super().__init__()
+        self._churn = None
+        self._churn_lock = threading.Lock()
+        self.engine = make_engine(url, pool_size)
+        with self.engine.connect() as conn:
+            if conn.execute(select(func.count()).select_from(clients)).scalar() == 0:
+                seed(self.engine, mock_data.BOOK_SIZE)
+
+    @cached("sql_book")
+    def book(self, size=None):
+        with self.engine.connect() as conn:
+            rows = conn.execute(BOOK if size is None else BOOK_LIMIT, {} if size is None else {"n": size}).all()
+        ids, names, scores, aum, last_contact, profiles = zip(*rows) if rows else ([],) * 6
+        codes = {p: i for i, p in enumerate(mock_data.RISK_PROFILES)}
+        return {
+            "client_id": np.array(ids, dtype=object),
+            "client_name": np.array(names, dtype=object),
+            "priority_score": np.array(scores, dtype=np.int16),
+            "aum_usd": np.array(aum, dtype=np.float64),
+            "last_contact_days": np.array(last_contact, dtype=np.int16),
+            "risk_profile": np.array([codes[p] for p in profiles], dtype=np.int8),
+        }
+
+    @cached("sql_registry")
+    def registry(self):
+        return ClientRegistry(self.book())
+
+    @cached("sql_book_risk")
+    def book_risk(self):
+        """Drift for the clients in the table; exposures come from mock_data, keyed by client id."""
+        return compute_book_risk(mock_data.get_mock_exposures(self.book()["client_id"]))
+
+    @cached("sql_top_drift")
+    def top_drift(self, k=10):
+        return mock_data.drift_table(self.book(), self.book_risk(), k)
+
+    @cached("sql_event_index")
+    def event_index(self):
+        """``events.EventIndex`` over the table's clients; event data is drawn per client id."""
+        book = self.book()
+        data = mock_data.client_event_data(book["client_id"])
+        return EventIndex(book["client_id"], book["client_name"], data["birth_date"],
+                          data["maturity_client"], data["maturity_date"], data["maturity_amount"])
+
+    @cached("sql_client_events")
+    def _events_page(self, day, n):
+        index = self.event_index()
+        return index.frame(index.upcoming(day, n))
+
+    def client_events(self, n=10):
+        return self._events_page(str(today()), n)
+
+    @cached("sql_maturity_flags")
+    def maturity_flags(self, day, days=30):
+        """Boolean mask over ``book()``: a bond matures within ``days`` of ``day``."""
+        flags = np.zeros(len(self.book()["client_id"]), dtype=bool)
+        start = np.datetime64(day, "D")
+        flags[self.event_index().clients_with("MATURITY", start, start + days)] = True
+        return flags
+
+    def churn_scorer(self):
+        """``churn.ChurnScorer`` over the table's clients, built on first use and kept for the process."""
+        if self._churn is None:
+            with self._churn_lock:
+                if self._churn is None:
+                    book = self.book()
+                    self._churn = ChurnScorer(book["client_id"], book["client_name"], mock_data.churn_features(book))
+        return self._churn
+
+    @cached("sql_churn_risk", key_params=("version",))
+    def _churn_top(self, k):
+        return mock_data.churn_table(self.churn_scorer(), k)
+
+    def churn_risk(self, k=10):
+        scorer = self.churn_scorer()
+        scorer.refresh()
+        return self._churn_top(k, version=scorer.version)
+
+    def record_contact(self, client_id):
+        return self.churn_scorer().record_contact(client_id)
+
+    @cached("sql_priority_page")
+    def priority_page(self, sort_by="priority_score", descending=True, reason=None, client_ids=None,
+                      offset=0, limit=25, score_range=None, aum_range=None):
+        book = self.book()
+        scores, masks = score_book(book, drift_flags(self.book_risk()["drift_norm"]),
+                                   self.maturity_flags(str(today())))
+        return mock_data.priority_page(book, scores, masks, self.registry(), sort_by, descending, reason,
+                                       client_ids, offset, limit, score_range, aum_range)
+
+    def portfolios(self, client_ids):
+        """One staged-id join for the whole set of clients; rows follow ``client_ids``."""
+        client_ids = list(client_ids)
+        row_of = {cid: i for i, cid in enumerate(client_ids)}
+        col_of = {a: j for j, a in enumerate(mock_data.ASSET_CLASSES)}
+        values = np.zeros((len(client_ids), len(col_of)), dtype=np.float32)
+        if client_ids:
+            with self.engine.begin() as conn:
+                conn.execute(CLEAR_STAGED)
+                conn.execute(STAGE_IDS, [{"client_id": cid} for cid in row_of])
+                rows = conn.execute(STAGED_POSITIONS).all()
+            if rows:
+                cids, instruments, mv = zip(*rows)
+                values[[row_of[c] for c in cids], [col_of[a] for a in instruments]] = mv
+        return _weights(values), values
+
+    @cached("sql_portfolio")
+    def portfolio(self, client_id):
+        with self.engine.connect() as conn:
+            rows = dict(conn.execute(CLIENT_POSITIONS, {"client_id": client_id}).all())
+        values = np.array([rows.get(a, 0.0) for a in mock_data.ASSET_CLASSES], dtype=np.float32)
+        return pd.DataFrame({
+            "Asset Class": mock_data.ASSET_CLASSES,
+            "Allocation": _weights(values[None, :])[0],
+            "Value USD": values,
+        })
+
+    def recommendations(self, client_ids=None, status=None):
+        query, params = RECOMMENDATIONS, {}
+        if client_ids is not None:
+            query = query.where(recommendations.c.client_id.in_(bindparam("ids", expanding=True)))
+            params["ids"] = list(client_ids)
+        if status is not None:
+            query = query.where(recommendations.c.status == bindparam("status"))
+            params["status"] = status
+        with self.engine.connect() as conn:
+            result = conn.execute(query, params)
+            return pd.DataFrame(result.all(), columns=list(result.keys()))
+
+    def save_recommendation(self, client_id, content, status="DRAFT"):
+        if status not in RECOMMENDATION_STATUSES:
+            raise ValueError(f"status must be one of {RECOMMENDATION_STATUSES}")
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(INSERT_RECOMMENDATION, {
+                    "client_id": client_id, "status": status, "content_json": json.dumps(content),
+                })
+                return result.inserted_primary_key[0]
+        except IntegrityError:  # recommendations.client_id -> clients.id
+            raise ValueError(f"unknown client {client_id!r}") from None
+
+    def log_action(self, entity_type, entity_id, action, user_id, details=None):
+        with self.engine.begin() as conn:
+            conn.execute(INSERT_AUDIT, {
+                "entity_type": entity_type, "entity_id": str(entity_id), "action": action,
+                "user_id": user_id, "details_json": json.dumps(details or {}),
+            })
+
+
+# --- CLI ---
+
+def _timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(provider, page_size=25):
+    """Best-of-5 timings of the provider queries, bypassing the data cache."""
+    ids = list(provider.book.uncached(provider)["client_id"])
+    page = ids[:page_size]
+    rows = [
+        ("book (all clients)", _timed(lambda: provider.book.uncached(provider))),
+        (f"portfolios, {len(page)} clients, one staged join", _timed(lambda: provider.portfolios(page))),
+        (f"portfolios, {len(page)} clients, one query each", _timed(lambda: [provider.portfolio.uncached(provider, c) for c in page])),
+        (f"portfolios, all {len(ids):,} clients", _timed(lambda: provider.portfolios(ids), repeat=1)),
+        ("portfolio, one client", _timed(lambda: provider.portfolio.uncached(provider, ids[0]))),
+    ]
+    for label, secs in rows:
+        print(f"{label:<44}{secs * 1e3:>10.2f} ms")
+
+
+def main(argv):
+    if not argv or argv[0] not in ("seed", "bench"):
+        print(__doc__.split("\n\n")[1])
+        return 2
+    if argv[0] == "seed":
+        size = int(argv[argv.index("--size") + 1]) if "--size" in argv else mock_data.BOOK_SIZE
+        engine = make_engine()
+        start = time.perf_counter()
+        n = seed(engine, size)
+        print(f"seeded {n:,} clients into {engine.url} in {time.perf_counter() - start:.1f}s")
+        return 0
+    page = int(argv[argv.index("--page") + 1]) if "--page" in argv else 25
+    bench(SqlDataProvider(), page)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
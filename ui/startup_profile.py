@@ -0,0 +1,93 @@
+"""Cold-start profiler for the Streamlit entry points.
+
+    python ui/startup_profile.py [streamlit_app] [presentation_app] [--top N]
+
+Each entry point is run once in a fresh interpreter (``python -X importtime``)
+through Streamlit's headless ``AppTest``. The report lists import time per
+top-level package, heaviest first, and the time to first render: wall time from
+process start until the first script run has finished. That figure is checked
+against ``TTFR_TARGET_S``, the target documented in README.md.
+"""
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+UI_DIR = Path(__file__).parent
+REPO_DIR = UI_DIR.parent
+ENTRY_POINTS = ["streamlit_app", "presentation_app"]
+
+# Time-to-first-render targets for a fresh server process, in seconds
+TTFR_TARGET_S = {"streamlit_app": 3.0, "presentation_app": 3.0}
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+print(json.dumps({"script_s": time.perf_counter() - t0, "errors": [e.value for e in at.exception]}))
+"""
+
+
+def parse_importtime(stderr):
+    """``{top-level package: self seconds}`` from ``-X importtime`` output."""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def profile(entry):
+    """Runs one entry point cold and returns its timing report."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD, str(UI_DIR / f"{entry}.py")],
+        cwd=REPO_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1]) if proc.returncode == 0 else {"errors": [proc.stderr[-2000:]]}
+    return {
+        "entry": entry,
+        "ttfr_s": wall,
+        "script_s": result.get("script_s"),
+        "errors": result["errors"],
+        "imports": parse_importtime(proc.stderr),
+    }
+
+
+def print_report(report, top=15):
+    entry = report["entry"]
+    target = TTFR_TARGET_S.get(entry)
+    status = "OK" if report["ttfr_s"] <= target else "OVER TARGET"
+    print(f"== {entry} ==")
+    print(f"time to first render: {report['ttfr_s']:.2f}s (target {target:.1f}s) {status}")
+    if report["errors"]:
+        print("script errors:", *report["errors"], sep="\n  ")
+    print(f"{'package':<28}{'import s':>10}")
+    for name, secs in sorted(report["imports"].items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{name:<28}{secs:>10.3f}")
+    print()
+
+
+def main(argv):
+    top = 15
+    if "--top" in argv:
+        i = argv.index("--top")
+        top = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    over = False
+    for entry in argv or ENTRY_POINTS:
+        report = profile(entry)
+        print_report(report, top)
+        over |= report["ttfr_s"] > TTFR_TARGET_S.get(entry, float("inf")) or bool(report["errors"])
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))